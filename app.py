@@ -2,6 +2,8 @@
 import sys
 import os
 import importlib.util
+import uuid
+from io import BytesIO
 
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 if PROJECT_ROOT not in sys.path:
@@ -29,14 +31,79 @@ import streamlit as st
 import plotly.graph_objects as go
 import pandas as pd
 
-from core.fetch_market_data import fetch_market_data
-from core.fetch_news import fetch_news
-from core.sentiment import analyze_sentiment, get_sentiment_label
+from core.fetch_market_data import fetch_market_data, CACHE_MAX_AGE
+from core.fetch_news import fetch_news, news_query, news_sentiment, NEWS_TTL
+from core.sentiment import get_sentiment_label
 from core.feature_engineering import create_features
+from core.sentiment_series import articles_frame
 from core.trading_signal import generate_signal
 from core.backtest import backtest_strategy
 from core.risk_metrics import sharpe_ratio, max_drawdown
 from core.walk_forward import walk_forward_validation
+from core.model_store import ModelStore
+from core.ml_model import CALIBRATION_METHODS, MODELS, model_name
+from core import profiling
+from core.profiling import stage
+from core.downsample import DEFAULT_POINTS, downsample_ohlc, lttb
+
+
+# ================== CACHED STAGES ==================
+# Each stage is keyed only by the inputs it depends on, so a widget change
+# reruns just the stages downstream of it:
+#   data (symbol, period) -> sentiment (query)
+#   -> models (symbol, period, model_type, calibration)
+# The on-disk ModelStore is opt-in (sidebar), since it writes one artifact
+# per walk-forward refit; st.cache_data already reuses the models' output.
+
+@st.cache_resource
+def get_model_store():
+    """Fitted models persisted across sessions."""
+    return ModelStore()
+
+
+@st.cache_data(ttl=CACHE_MAX_AGE, show_spinner="Fetching market data...")
+def load_market_data(symbol, period):
+    data = fetch_market_data(symbol, period)
+
+    if data is None or data.empty:
+        return None
+
+    return data[data["close"] > 0].reset_index(drop=True)
+
+
+@st.cache_data(ttl=NEWS_TTL, show_spinner="Fetching news...")
+def load_sentiment(query):
+    """Articles, their polarity scores and the average polarity."""
+
+    articles = fetch_news(query)
+    scores = news_sentiment(articles)
+    avg = sum(scores) / len(scores) if scores else 0.0
+
+    return articles, scores, avg
+
+
+@st.cache_data(ttl=CACHE_MAX_AGE, show_spinner="Training models...")
+def run_models(symbol, period, model_type, calibration=None, store_models=False):
+    """Walk-forward predictions on the feature rows they belong to."""
+
+    data = load_market_data(symbol, period)
+    articles, scores, avg_sentiment = load_sentiment(news_query(symbol))
+
+    news_df = articles_frame(articles, scores) if articles else None
+    features_df = create_features(data, avg_sentiment, news_df=news_df)
+
+    return walk_forward_validation(
+        features_df, model_type, store=get_model_store() if store_models else None,
+        symbol=symbol, calibration=calibration
+    )
+
+
+@st.cache_data(ttl=CACHE_MAX_AGE)
+def run_backtest(symbol, period, model_type, calibration=None, cost=0.001, store_models=False):
+    return backtest_strategy(
+        run_models(symbol, period, model_type, calibration, store_models), cost=cost
+    )
+
 
 # ================== STREAMLIT CONFIG ==================
 st.set_page_config(
@@ -61,53 +128,81 @@ period = st.sidebar.selectbox(
     index=4
 )
 
+st.sidebar.header("🖼️ Charts")
+
+# Long histories are reduced server-side before they reach the browser
+full_resolution = st.sidebar.checkbox("Full resolution", value=False)
+point_budget = None if full_resolution else st.sidebar.slider(
+    "Chart point budget",
+    min_value=200,
+    max_value=10_000,
+    value=DEFAULT_POINTS,
+    step=100
+)
+
+profile_run = st.sidebar.checkbox("⏱️ Profile pipeline", value=profiling.is_enabled())
+profile_memory = profile_run and st.sidebar.checkbox(
+    "Track peak memory", value=profiling.memory_enabled()
+)
+
+# Each rerun starts a fresh profile of this session only; the process-wide
+# profiling switches (MSA_PROFILE*) are left alone for other sessions
+profile_key = st.session_state.setdefault("profile_key", uuid.uuid4().hex)
+
+if profile_run:
+    st.session_state["profile"] = profiling.start_collecting(profile_key, memory=profile_memory)
+else:
+    profiling.stop_collecting(profile_key)
+    st.session_state.pop("profile", None)
+
+st.sidebar.header("🤖 Models")
+
+store_models = st.sidebar.checkbox(
+    "💾 Reuse stored models",
+    value=False,
+    help="Persist every walk-forward refit on disk and reuse it across sessions"
+)
+
 # ================== MARKET DATA ==================
-data = fetch_market_data(symbol, period)
+data = load_market_data(symbol, period)
 
 if data is None or data.empty:
     st.error("❌ No market data available")
     st.stop()
 
-data = data[data["close"] > 0]
-
 st.subheader(f"📈 Price Chart – {symbol}")
 
-fig = go.Figure(
-    data=[
-        go.Candlestick(
-            x=data["datetime"],
-            open=data["open"],
-            high=data["high"],
-            low=data["low"],
-            close=data["close"]
-        )
-    ]
-)
+with stage("render.price_chart"):
+    candles = downsample_ohlc(data, point_budget)
+
+    fig = go.Figure(
+        data=[
+            go.Candlestick(
+                x=candles["datetime"],
+                open=candles["open"],
+                high=candles["high"],
+                low=candles["low"],
+                close=candles["close"]
+            )
+        ]
+    )
 
-fig.update_layout(
-    height=500,
-    template="plotly_dark",
-    xaxis_title="Date",
-    yaxis_title="Price",
-    xaxis_rangeslider_visible=False
-)
+    fig.update_layout(
+        height=500,
+        template="plotly_dark",
+        xaxis_title="Date",
+        yaxis_title="Price",
+        xaxis_rangeslider_visible=False
+    )
 
-st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(fig, use_container_width=True)
 
 # ================== NEWS & SENTIMENT ==================
 st.subheader("📰 Market News & Sentiment")
 
-avg_sentiment = 0.0
-query = symbol.replace("-USD", "")
-articles = fetch_news(query)
-
-sentiment_scores = []
-for article in articles:
-    text = f"{article['title']} {article.get('description', '')}"
-    sentiment_scores.append(analyze_sentiment(text))
+articles, sentiment_scores, avg_sentiment = load_sentiment(news_query(symbol))
 
 if sentiment_scores:
-    avg_sentiment = sum(sentiment_scores) / len(sentiment_scores)
     label = get_sentiment_label(avg_sentiment)
 
     col1, col2 = st.columns(2)
@@ -122,23 +217,27 @@ else:
 # ================== ML PREDICTION ==================
 st.subheader("🤖 AI Market Prediction")
 
-model_choice = st.selectbox(
+col1, col2 = st.columns(2)
+
+model_type = col1.selectbox(
     "Choose ML Model",
-    ["Random Forest", "Logistic Regression"]
+    ["rf", "lr"] + [m for m in MODELS if m not in ("rf", "lr")],
+    format_func=model_name
 )
 
-model_type = "rf" if model_choice == "Random Forest" else "lr"
+calibration = col2.selectbox(
+    "Probability Calibration",
+    [None, *CALIBRATION_METHODS],
+    format_func=lambda c: "None" if c is None else c.capitalize()
+)
 
-features_df = create_features(data, avg_sentiment)
+model_choice = model_name(model_type, calibration)
 
-wf_df = walk_forward_validation(features_df, model_type)
+wf_df = run_models(symbol, period, model_type, calibration, store_models)
 
 prediction = wf_df["prediction"].iloc[-1]
 confidence = wf_df["confidence"].iloc[-1]
 
-features_df["prediction"] = wf_df["prediction"]
-features_df["confidence"] = wf_df["confidence"]
-
 if pd.isna(prediction):
     st.warning("Not enough data for prediction. Use 6mo or 1y.")
     st.stop()
@@ -156,7 +255,7 @@ st.caption("Model evaluated using walk-forward validation")
 # ================== PREDICTION DISTRIBUTION ==================
 st.subheader("🥧 Prediction Distribution")
 
-pred_counts = features_df["prediction"].value_counts(dropna=True)
+pred_counts = wf_df["prediction"].value_counts(dropna=True)
 
 labels, values = [], []
 if 1 in pred_counts:
@@ -166,33 +265,37 @@ if 0 in pred_counts:
     labels.append("Bearish")
     values.append(pred_counts[0])
 
-fig_pred = go.Figure(
-    data=[go.Pie(labels=labels, values=values, hole=0.4)]
-)
+with stage("render.prediction_pie"):
+    fig_pred = go.Figure(
+        data=[go.Pie(labels=labels, values=values, hole=0.4)]
+    )
 
-fig_pred.update_layout(
-    template="plotly_dark",
-    title="Model Prediction Distribution"
-)
+    fig_pred.update_layout(
+        template="plotly_dark",
+        title="Model Prediction Distribution"
+    )
 
-st.plotly_chart(fig_pred, use_container_width=True)
+    st.plotly_chart(fig_pred, use_container_width=True)
 
 # ================== BACKTESTING ==================
 st.subheader("📉 Strategy Backtesting")
 
-bt_df = backtest_strategy(features_df, cost=0.001)
+bt_df = run_backtest(symbol, period, model_type, calibration, cost=0.001, store_models=store_models)
 
-fig_bt = go.Figure()
-fig_bt.add_trace(go.Scatter(y=bt_df["cum_strategy"], name="AI Strategy"))
-fig_bt.add_trace(go.Scatter(y=bt_df["cum_market"], name="Buy & Hold"))
+with stage("render.equity_curve"):
+    fig_bt = go.Figure()
 
-fig_bt.update_layout(
-    template="plotly_dark",
-    xaxis_title="Time",
-    yaxis_title="Cumulative Return"
-)
+    for column, name in (("cum_strategy", "AI Strategy"), ("cum_market", "Buy & Hold")):
+        x, y = lttb(bt_df["datetime"], bt_df[column], point_budget)
+        fig_bt.add_trace(go.Scatter(x=x, y=y, name=name))
+
+    fig_bt.update_layout(
+        template="plotly_dark",
+        xaxis_title="Date",
+        yaxis_title="Cumulative Return"
+    )
 
-st.plotly_chart(fig_bt, use_container_width=True)
+    st.plotly_chart(fig_bt, use_container_width=True)
 
 # ================== VOLATILITY REGIME ==================
 st.subheader("🔥 Volatility Regime Analysis")
@@ -209,28 +312,30 @@ regime_returns = (
     .reset_index()
 )
 
-fig_regime = go.Figure(
-    data=go.Heatmap(
-        z=[regime_returns["strategy_return"]],
-        x=regime_returns["vol_regime"],
-        y=["Avg Strategy Return"],
-        colorscale="RdYlGn",
-        zmid=0
+with stage("render.volatility_regimes"):
+    fig_regime = go.Figure(
+        data=go.Heatmap(
+            z=[regime_returns["strategy_return"]],
+            x=regime_returns["vol_regime"],
+            y=["Avg Strategy Return"],
+            colorscale="RdYlGn",
+            zmid=0
+        )
     )
-)
 
-fig_regime.update_layout(
-    template="plotly_dark",
-    title="Performance Across Volatility Regimes"
-)
+    fig_regime.update_layout(
+        template="plotly_dark",
+        title="Performance Across Volatility Regimes"
+    )
 
-st.plotly_chart(fig_regime, use_container_width=True)
+    st.plotly_chart(fig_regime, use_container_width=True)
 
 # ================== RISK METRICS ==================
 st.subheader("📊 Risk Metrics")
 
-sharpe = sharpe_ratio(bt_df["strategy_return"])
-drawdown = max_drawdown(bt_df["cum_strategy"])
+with stage("risk_metrics"):
+    sharpe = sharpe_ratio(bt_df["strategy_return"])
+    drawdown = max_drawdown(bt_df["cum_strategy"])
 
 c1, c2 = st.columns(2)
 c1.metric("Sharpe Ratio", f"{sharpe:.2f}")
@@ -240,26 +345,29 @@ c2.metric("Max Drawdown", f"{drawdown:.2%}")
 st.subheader("📄 Research Report")
 
 if st.button("Generate Full Research PDF"):
-    report_assets.save_equity_curve(bt_df)
+    # Charts and PDF stay in memory, so concurrent sessions never share files
+    charts = report_assets.report_charts(bt_df, point_budget)
+    pdf = BytesIO()
 
     report_generator.generate_research_report(
-        filename=f"{symbol}_research_report.pdf",
+        filename=pdf,
         symbol=symbol,
         model_name=model_choice,
         prediction="Bullish" if prediction == 1 else "Bearish",
         signal=signal,
         sharpe=sharpe,
         drawdown=drawdown,
-        equity_curve_path="equity_curve.png"
+        equity_curve_path=charts["equity_curve"],
+        prediction_distribution=charts["prediction_distribution"],
+        trade_outcomes=charts["trade_outcomes"]
     )
 
-    with open(f"{symbol}_research_report.pdf", "rb") as f:
-        st.download_button(
-            "📥 Download Full Research Report",
-            f,
-            file_name=f"{symbol}_research_report.pdf",
-            mime="application/pdf"
-        )
+    st.download_button(
+        "📥 Download Full Research Report",
+        pdf.getvalue(),
+        file_name=f"{symbol}_research_report.pdf",
+        mime="application/pdf"
+    )
 
 # ================== NEWS DISPLAY ==================
 st.subheader("🗞️ Top News")
@@ -269,3 +377,7 @@ for article in articles[:5]:
     st.caption(article["source"]["name"])
     st.write(article.get("description", ""))
     st.markdown("---")
+
+# ================== PROFILE ==================
+if "profile" in st.session_state:
+    profiling.streamlit_panel(st, stats=st.session_state["profile"])
@@ -0,0 +1,226 @@
+"""
+Benchmark harness for the core pipeline modules.
+
+Times create_features, walk_forward_validation (lr, rf and hgb),
+backtest_strategy, the risk metrics and the PDF report on seeded
+synthetic data at several sizes. Results are written as JSON. When a
+baseline file exists, every case is compared against it and reported as
+a regression if it is slower than baseline x (1 + tolerance).
+
+Usage:
+    python -m benchmarks.run                          # 1k, 10k, 100k bars
+    python -m benchmarks.run --sizes 1000 10000 --repeat 5
+    python -m benchmarks.run --save-baseline          # record a new baseline
+    python -m benchmarks.run --cases backtest risk_metrics --tolerance 0.1
+
+Exit status is 1 when any case regressed.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("MPLBACKEND", "Agg")
+
+import numpy as np
+import pandas as pd
+import sklearn
+
+from benchmarks.synthetic import synthetic_news, synthetic_ohlc
+from core.backtest import backtest_strategy, njit
+from core.batch import write_report
+from core.feature_engineering import create_features
+from core.risk_metrics import compute_all_metrics, max_drawdown, rolling_metrics, sharpe_ratio
+from core.sentiment_series import articles_frame
+from core.walk_forward import walk_forward_validation
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_TOLERANCE = 0.25
+
+# Upper bound on refits per walk-forward run, so large sizes finish in
+# reasonable time; refit_every is derived from it
+MAX_REFITS = {"lr": 50, "rf": 10, "hgb": 10}
+
+
+def _walk_forward_case(model_type):
+    def run(data):
+        n_test = len(data["features"]) - int(len(data["features"]) * 0.7)
+        refit_every = max(1, -(-n_test // MAX_REFITS[model_type]))
+        return walk_forward_validation(data["features"], model_type, refit_every=refit_every)
+    return run
+
+
+def _risk_metrics(data):
+    bt = data["backtest"]
+    sharpe_ratio(bt["strategy_return"])
+    max_drawdown(bt["cum_strategy"])
+    compute_all_metrics(bt["strategy_return"], bt["cum_strategy"], bt["position_size"])
+    rolling_metrics(bt["strategy_return"])
+
+
+def _report(data):
+    write_report(
+        data["backtest"], os.path.join(data["tmpdir"], "report.pdf"),
+        "SYN", "Logistic Regression", 1, "HOLD", 1.0, -0.1
+    )
+
+
+CASES = {
+    "create_features": lambda data: create_features(data["ohlc"], news_df=data["news"]),
+    "walk_forward_lr": _walk_forward_case("lr"),
+    "walk_forward_rf": _walk_forward_case("rf"),
+    "walk_forward_hgb": _walk_forward_case("hgb"),
+    "backtest": lambda data: backtest_strategy(data["predictions"]),
+    "risk_metrics": _risk_metrics,
+    "report": _report,
+}
+
+
+def make_data(n_bars, seed, tmpdir):
+    """Inputs for every case at one size, built outside the timed region."""
+
+    ohlc = synthetic_ohlc(n_bars, seed=seed)
+    articles, polarities = synthetic_news(ohlc["datetime"], seed=seed)
+    news = articles_frame(articles, polarities)
+
+    features = create_features(ohlc, news_df=news)
+
+    # Backtest input: walk-forward shaped frame with seeded forecasts
+    rng = np.random.default_rng(seed)
+    confidence = rng.uniform(0.3, 0.8, len(features))
+    predictions = features.reset_index(drop=True).assign(
+        confidence=confidence,
+        prediction=(confidence > 0.5).astype(float)
+    )
+
+    return {
+        "ohlc": ohlc,
+        "news": news,
+        "features": features,
+        "predictions": predictions,
+        "backtest": backtest_strategy(predictions),
+        "tmpdir": tmpdir,
+    }
+
+
+def time_case(func, data, repeat, warmup=True):
+    """Best and median wall time of repeat runs (after an optional warm-up run)."""
+
+    if warmup:
+        func(data)
+
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(data)
+        times.append(time.perf_counter() - start)
+
+    return min(times), statistics.median(times)
+
+
+def environment():
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "numpy": np.__version__,
+        "pandas": pd.__version__,
+        "sklearn": sklearn.__version__,
+        "numba": njit is not None,
+    }
+
+
+def run(sizes=DEFAULT_SIZES, cases=None, repeat=3, seed=0, log=print):
+    """Run the benchmarks; returns {"environment": ..., "results": {case@size: stats}}."""
+
+    cases = cases or list(CASES)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for n_bars in sizes:
+            data = make_data(n_bars, seed, tmpdir)
+
+            for case in cases:
+                # One cold run for the slow large-size model fits
+                slow = case.startswith("walk_forward") and n_bars >= 100_000
+                best, median = time_case(CASES[case], data, 1 if slow else repeat, warmup=not slow)
+
+                key = f"{case}@{n_bars}"
+                results[key] = {"case": case, "bars": n_bars, "best_s": best, "median_s": median}
+                log(f"{key:<28} best {best:9.4f}s  median {median:9.4f}s")
+
+    return {"environment": environment(), "results": results}
+
+
+def compare(current, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Rows of (key, baseline_s, current_s, ratio, regressed) for the cases
+    present in both runs, compared on best time.
+    """
+
+    rows = []
+    for key, stats in current["results"].items():
+        base = baseline.get("results", {}).get(key)
+        if base is None:
+            continue
+
+        ratio = stats["best_s"] / base["best_s"] if base["best_s"] > 0 else float("inf")
+        rows.append((key, base["best_s"], stats["best_s"], ratio, ratio > 1 + tolerance))
+
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the core pipeline modules")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES))
+    parser.add_argument("--cases", nargs="+", choices=list(CASES), default=None)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON to compare with")
+    parser.add_argument("--output", help="Write this run's results to a JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Allowed slowdown before a case counts as a regression (0.25 = 25%%)")
+    args = parser.parse_args(argv)
+
+    current = run(args.sizes, args.cases, args.repeat, args.seed)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(current, f, indent=2)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+
+    rows = compare(current, baseline, args.tolerance)
+    regressions = [row for row in rows if row[4]]
+
+    print()
+    for key, base, now, ratio, regressed in rows:
+        flag = "REGRESSION" if regressed else "ok"
+        print(f"{key:<28} {base:9.4f}s -> {now:9.4f}s  x{ratio:5.2f}  {flag}")
+
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) beyond {args.tolerance:.0%} tolerance")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
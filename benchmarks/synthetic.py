@@ -0,0 +1,70 @@
+"""
+Synthetic, seeded market data for benchmarks (no network access).
+
+synthetic_ohlc draws a geometric random walk with consistent
+open / high / low / close / volume bars; synthetic_news draws
+NewsAPI-style article dicts with timestamps spread over the same bars
+plus their polarity scores, ready for sentiment_series.articles_frame.
+"""
+
+import numpy as np
+import pandas as pd
+
+_WORDS = np.array([
+    "shares", "rally", "slump", "earnings", "beat", "miss", "guidance",
+    "upgrade", "downgrade", "record", "growth", "weak", "strong", "outlook",
+    "investors", "cautious", "surge", "drop", "profit", "loss",
+])
+
+
+def synthetic_ohlc(n_bars, seed=0, freq="h", start="2010-01-01"):
+    """OHLCV frame of n_bars bars with a 'datetime' column (UTC)."""
+
+    rng = np.random.default_rng(seed)
+
+    returns = rng.normal(0.0002, 0.01, n_bars)
+    close = 100 * np.cumprod(1 + returns)
+    open_ = close * (1 + rng.normal(0, 0.002, n_bars))
+
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.003, n_bars)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.003, n_bars)))
+
+    return pd.DataFrame({
+        "datetime": pd.date_range(start, periods=n_bars, freq=freq, tz="UTC"),
+        "open": open_,
+        "high": high,
+        "low": low,
+        "close": close,
+        "volume": rng.integers(100_000, 1_000_000, n_bars).astype(float),
+    })
+
+
+def synthetic_news(bar_times, per_bar=0.2, seed=0):
+    """
+    (articles, polarities) with about per_bar articles per bar, published
+    at random times between the first and last bar.
+    """
+
+    rng = np.random.default_rng(seed)
+    bar_times = pd.to_datetime(pd.Series(bar_times), utc=True)
+
+    n = max(1, int(len(bar_times) * per_bar))
+    lo = bar_times.iloc[0].value
+    hi = bar_times.iloc[-1].value
+
+    published = pd.to_datetime(np.sort(rng.integers(lo, hi, n)), utc=True)
+    polarities = np.clip(rng.normal(0.05, 0.3, n), -1, 1)
+    words = _WORDS[rng.integers(0, len(_WORDS), (n, 6))]
+
+    articles = [
+        {
+            "title": " ".join(words[k]),
+            "description": " ".join(words[k][::-1]),
+            "url": f"https://example.com/news/{k}",
+            "publishedAt": published[k].isoformat(),
+            "source": {"name": "Synthetic"},
+        }
+        for k in range(n)
+    ]
+
+    return articles, polarities.tolist()
@@ -0,0 +1,257 @@
+"""
+Asynchronous multi-symbol data acquisition.
+
+Fetches prices and news for many symbols concurrently:
+- providers are blocking callables (one key per request) run on a shared
+  thread pool, each thread reusing its own pooled HTTP session
+- every provider has its own token-bucket rate limit and concurrency cap
+- failed requests are retried with exponential backoff and jitter when
+  the provider considers the error transient
+- identical in-flight requests (same provider and key) are coalesced
+  into one call whose result every caller shares
+
+Providers are pluggable: anything implementing Provider.fetch(key) can
+be registered, e.g. CallableProvider around a local function in tests.
+
+Usage:
+    results = fetch_all(["AAPL", "MSFT", "AAPL"], period="1y")
+    results["AAPL"]["prices"], results["AAPL"]["articles"]
+"""
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from core.fetch_market_data import fetch_bars
+from core.fetch_news import fetch_articles, is_retryable as news_retryable, news_query
+from core.http import backoff_delay, is_transient
+
+# Worker threads shared by all providers
+MAX_WORKERS = 16
+
+
+class TokenBucket:
+    """Allows rate requests per second on average, with bursts of up to burst."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = float(rate)
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class Provider:
+    """
+    A named blocking data source. Subclasses implement fetch(key);
+    rate (requests / second), burst, concurrency and retries tune how
+    the acquirer calls it.
+    """
+
+    name = "provider"
+    rate = 5.0
+    burst = 5
+    concurrency = 8
+    retries = 3
+    base_delay = 0.5
+
+    def fetch(self, key):
+        raise NotImplementedError
+
+    def retryable(self, exc):
+        return is_transient(exc)
+
+
+class PriceProvider(Provider):
+    """OHLC bars through fetch_market_data's source and on-disk cache."""
+
+    name = "prices"
+    rate = 2.0
+    burst = 4
+
+    def __init__(self, period="1y", interval="1d", source=None, cache=None):
+        self.period = period
+        self.interval = interval
+        self.source = source
+        self.cache = cache
+
+    def fetch(self, symbol):
+        return fetch_bars(
+            symbol, self.period, self.interval,
+            source=self.source, cache=self.cache
+        )
+
+
+class NewsProvider(Provider):
+    """NewsAPI articles through the persistent article store."""
+
+    name = "news"
+    rate = 1.0
+    burst = 2
+    concurrency = 4
+
+    def __init__(self, page_size=10, cache=None, api_key=None):
+        self.page_size = page_size
+        self.cache = cache
+        self.api_key = api_key
+
+    def fetch(self, query):
+        # Retries are handled by the acquirer, not inside the worker thread
+        return fetch_articles(
+            query, self.page_size, cache=self.cache,
+            api_key=self.api_key, retries=0
+        )
+
+    def retryable(self, exc):
+        return news_retryable(exc)
+
+
+class CallableProvider(Provider):
+    """Wraps a plain function key -> result, e.g. a local stand-in for tests."""
+
+    def __init__(self, name, func, rate=100.0, burst=100, concurrency=8, retries=0, retryable=None):
+        self.name = name
+        self.func = func
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+        self.retries = retries
+        self._retryable = retryable
+
+    def fetch(self, key):
+        return self.func(key)
+
+    def retryable(self, exc):
+        return self._retryable(exc) if self._retryable else is_transient(exc)
+
+
+class Acquirer:
+    """
+    Runs provider requests on a shared thread pool under each provider's
+    rate limit, concurrency cap and retry policy. Create and use it inside
+    one event loop.
+    """
+
+    def __init__(self, providers, max_workers=MAX_WORKERS):
+        self.providers = {p.name: p for p in providers}
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.stats = {"requests": 0, "coalesced": 0, "retries": 0, "errors": 0}
+
+        self._buckets = {p.name: TokenBucket(p.rate, p.burst) for p in providers}
+        self._slots = {p.name: asyncio.Semaphore(p.concurrency) for p in providers}
+        self._inflight = {}
+
+    async def _call(self, provider, key):
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(provider.retries + 1):
+            await self._buckets[provider.name].acquire()
+
+            try:
+                async with self._slots[provider.name]:
+                    self.stats["requests"] += 1
+                    return await loop.run_in_executor(self.executor, provider.fetch, key)
+
+            except Exception as e:
+                if attempt == provider.retries or not provider.retryable(e):
+                    self.stats["errors"] += 1
+                    raise
+
+                self.stats["retries"] += 1
+                await asyncio.sleep(backoff_delay(attempt, provider.base_delay))
+
+    async def fetch(self, provider_name, key):
+        """Result of one request; concurrent duplicates share a single call."""
+
+        request = (provider_name, key)
+        task = self._inflight.get(request)
+
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            task = asyncio.ensure_future(self._call(self.providers[provider_name], key))
+            self._inflight[request] = task
+            task.add_done_callback(lambda _: self._inflight.pop(request, None))
+
+        # Shielded so one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
+
+    async def fetch_many(self, requests):
+        """
+        Results for (provider_name, key) pairs, in order. A failed request
+        yields its exception instead of raising.
+        """
+        return await asyncio.gather(
+            *(self.fetch(name, key) for name, key in requests),
+            return_exceptions=True
+        )
+
+    def close(self):
+        self.executor.shutdown(wait=False)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.close()
+
+
+async def acquire(symbols, period="1y", interval="1d", with_news=True,
+                  price_provider=None, news_provider=None, max_workers=MAX_WORKERS):
+    """
+    Prices (and news) for every symbol, fetched concurrently.
+
+    Returns symbol -> {"prices": DataFrame or None, "articles": list,
+    "errors": {provider: message}}. Duplicate symbols are fetched once.
+    """
+
+    prices = price_provider or PriceProvider(period, interval)
+    providers = [prices]
+
+    news = None
+    if with_news:
+        news = news_provider or NewsProvider()
+        providers.append(news)
+
+    symbols = list(dict.fromkeys(symbols))
+
+    requests = [(prices.name, s) for s in symbols]
+    if news is not None:
+        requests += [(news.name, news_query(s)) for s in symbols]
+
+    async with Acquirer(providers, max_workers=max_workers) as acquirer:
+        outcomes = await acquirer.fetch_many(requests)
+
+    results = {s: {"prices": None, "articles": [], "errors": {}} for s in symbols}
+    n = len(symbols)
+
+    for k, symbol in enumerate(symbols):
+        slots = [("prices", prices.name, outcomes[k])]
+        if news is not None:
+            slots.append(("articles", news.name, outcomes[n + k]))
+
+        for field, name, outcome in slots:
+            if isinstance(outcome, Exception):
+                results[symbol]["errors"][name] = str(outcome)
+            elif outcome is not None:
+                results[symbol][field] = outcome
+
+    return results
+
+
+def fetch_all(symbols, **kwargs):
+    """Blocking wrapper around acquire() for scripts and batch jobs."""
+    return asyncio.run(acquire(symbols, **kwargs))
@@ -1,10 +1,161 @@
 import numpy as np
+import pandas as pd
 
+try:
+    from numba import njit
+except ImportError:  # optional: fall back to the NumPy kernel
+    njit = None
+
+from core.profiling import profiled
+
+
+# ===============================
+# Per-bar trading rules
+# ===============================
+
+def _bar_step(ret, vol, pred, conf, cost, conf_threshold):
+    """
+    Position size and strategy return for one bar:
+    volatility-based base position x confidence weight, long on
+    prediction 1, short on prediction 0, cost proportional to exposure.
+    """
+    base_position = 0.0 if vol == 0 else min(1 / vol, 3.0)
+
+    conf_weight = (conf - conf_threshold) / (1 - conf_threshold)
+    conf_weight = min(max(conf_weight, 0.0), 1.0)
+
+    position_size = base_position * conf_weight
+
+    if pred == 1:
+        strategy_return = ret * position_size
+    elif pred == 0:
+        strategy_return = -ret * position_size
+    else:
+        strategy_return = 0.0
+
+    return position_size, strategy_return - cost * position_size
+
+
+def _backtest_loop(ret, vol, pred, conf, cost, conf_threshold, max_drawdown_limit, step):
+    """
+    Single pass over the bars: sizing, costs, equity, peak, drawdown and
+    the stop rule. A bar whose close breaches the drawdown limit keeps its
+    realized return; trading stops from the next bar on.
+    """
+    n = len(ret)
+
+    position_size = np.zeros(n)
+    strategy_return = np.zeros(n)
+    cum_strategy = np.empty(n)
+    cum_market = np.empty(n)
+    peak = np.empty(n)
+    drawdown = np.empty(n)
+
+    equity = 1.0
+    market = 1.0
+    top = 0.0
+    stopped = False
+
+    for t in range(n):
+        if not stopped:
+            position_size[t], strategy_return[t] = step(
+                ret[t], vol[t], pred[t], conf[t], cost, conf_threshold
+            )
+
+        equity *= 1 + strategy_return[t]
+        market *= 1 + ret[t]
+        top = equity if t == 0 else max(top, equity)
+
+        cum_strategy[t] = equity
+        cum_market[t] = market
+        peak[t] = top
+        drawdown[t] = (top - equity) / top
+
+        if drawdown[t] > max_drawdown_limit:
+            stopped = True
+
+    return position_size, strategy_return, cum_strategy, cum_market, peak, drawdown
+
+
+def _backtest_numpy(ret, vol, pred, conf, cost, conf_threshold, max_drawdown_limit):
+    """Vectorized equivalent of _backtest_loop for when numba is missing."""
+
+    with np.errstate(divide="ignore"):
+        base_position = np.where(vol != 0, 1 / vol, 0.0)
+    base_position = np.minimum(base_position, 3)
+
+    conf_weight = np.clip((conf - conf_threshold) / (1 - conf_threshold), 0, 1)
+    position_size = base_position * conf_weight
+
+    direction = np.where(pred == 1, 1.0, np.where(pred == 0, -1.0, 0.0))
+    strategy_return = direction * ret * position_size - cost * position_size
+
+    cum_strategy = np.cumprod(1 + strategy_return)
+    peak = np.maximum.accumulate(cum_strategy)
+    breach = np.flatnonzero((peak - cum_strategy) / peak > max_drawdown_limit)
+
+    if len(breach) > 0:
+        # Trade through the breaching bar, flat afterwards
+        position_size[breach[0] + 1:] = 0.0
+        strategy_return[breach[0] + 1:] = 0.0
+        cum_strategy = np.cumprod(1 + strategy_return)
+        peak = np.maximum.accumulate(cum_strategy)
+
+    cum_market = np.cumprod(1 + ret)
+    drawdown = (peak - cum_strategy) / peak
+
+    return position_size, strategy_return, cum_strategy, cum_market, peak, drawdown
+
+
+if njit is not None:
+    _bar_step_jit = njit(cache=True)(_bar_step)
+    _backtest_loop_jit = njit(cache=True)(_backtest_loop)
+
+
+def backtest_arrays(
+    ret,
+    vol,
+    pred,
+    conf,
+    cost=0.001,
+    conf_threshold=0.52,
+    max_drawdown_limit=0.30
+):
+    """
+    Path-dependent backtest kernel on clean (NaN-free) NumPy arrays.
+
+    Uses a compiled single-pass loop when numba is installed and a
+    vectorized NumPy equivalent otherwise. Returns a dict of preallocated
+    arrays: position_size, strategy_return, cum_strategy, cum_market,
+    peak, drawdown.
+    """
+
+    args = (
+        np.ascontiguousarray(ret, dtype=np.float64),
+        np.ascontiguousarray(vol, dtype=np.float64),
+        np.ascontiguousarray(pred, dtype=np.float64),
+        np.ascontiguousarray(conf, dtype=np.float64),
+        float(cost),
+        float(conf_threshold),
+        float(max_drawdown_limit),
+    )
+
+    if njit is not None:
+        out = _backtest_loop_jit(*args, _bar_step_jit)
+    else:
+        out = _backtest_numpy(*args)
+
+    keys = ("position_size", "strategy_return", "cum_strategy", "cum_market", "peak", "drawdown")
+    return dict(zip(keys, out))
+
+
+@profiled("backtest")
 def backtest_strategy(
     df,
     cost=0.001,
     conf_threshold=0.52,
-    max_drawdown_limit=0.30
+    max_drawdown_limit=0.30,
+    signals=None
 ):
     """
     Advanced backtesting engine with:
@@ -13,75 +164,151 @@ def backtest_strategy(
     - Long / Short trading
     - Transaction costs
     - Drawdown-based capital protection
+
+    The equity path is computed by backtest_arrays in one pass; the
+    result columns are attached to the frame once.
+
+    signals: optional int8 codes from generate_signals (array aligned with
+    df, or a column name). BUY trades long, SELL short and HOLD stays flat,
+    instead of trading every prediction. Held bars are sized with the
+    confidence of the bar that opened the position.
     """
 
-    df = df.copy()
+    if signals is not None:
+        df = df.assign(signal=df[signals] if isinstance(signals, str) else np.asarray(signals))
 
     # ===============================
     # Safety cleanup
     # ===============================
     df = df.dropna(subset=["return", "volatility", "prediction", "confidence"])
 
-    # ===============================
-    # Volatility-based base position
-    # ===============================
-    df["vol_adj"] = df["volatility"].replace(0, np.nan)
-    df["base_position"] = 1 / df["vol_adj"]
-    df["base_position"] = df["base_position"].clip(upper=3)
-    df["base_position"] = df["base_position"].fillna(0)
+    pred = df["prediction"].to_numpy()
+    conf = df["confidence"].to_numpy()
 
-    # ===============================
-    # Confidence weighting
-    # ===============================
-    df["conf_weight"] = (df["confidence"] - conf_threshold) / (1 - conf_threshold)
-    df["conf_weight"] = df["conf_weight"].clip(0, 1)
+    if signals is not None:
+        # Signal sets the direction; HOLD gets zero confidence weight.
+        # A position kept open by the signal rules (hysteresis, min_hold)
+        # keeps the confidence weight of its entry bar, so a held BUY is
+        # not flattened when confidence later drops below conf_threshold.
+        sig = df["signal"].to_numpy()
+        pred = np.where(sig == 1, 1.0, 0.0)
 
-    # Final position size
-    df["position_size"] = df["base_position"] * df["conf_weight"]
+        entry = np.ones(len(sig), dtype=bool)
+        entry[1:] = sig[1:] != sig[:-1]
+        conf = pd.Series(np.where(entry, conf, np.nan)).ffill().to_numpy()
+        conf = np.where(sig == 0, 0.0, conf)
 
-    # ===============================
-    # Strategy returns (before risk stop)
-    # ===============================
-    df["strategy_return"] = 0.0
-
-    # Long trades
-    df.loc[df["prediction"] == 1, "strategy_return"] = (
-        df["return"] * df["position_size"]
+    result = backtest_arrays(
+        df["return"].to_numpy(),
+        df["volatility"].to_numpy(),
+        pred,
+        conf,
+        cost=cost,
+        conf_threshold=conf_threshold,
+        max_drawdown_limit=max_drawdown_limit
     )
 
-    # Short trades
-    df.loc[df["prediction"] == 0, "strategy_return"] = (
-        -df["return"] * df["position_size"]
+    return df.assign(**result)
+
+
+def backtest_sweep(
+    df,
+    conf_thresholds=(0.52,),
+    costs=(0.001,),
+    max_drawdown_limits=(0.30,),
+    max_cells=2_000_000
+):
+    """
+    Evaluate backtest_strategy over a full parameter grid in one pass.
+
+    Every (conf_threshold, cost) pair becomes a row of a 2-D
+    (pairs x time) array computed with NumPy broadcasting. The drawdown
+    stop only truncates a path, so each max_drawdown_limit is scored from
+    running sums of its pair's unstopped path at the bar the stop fires,
+    instead of recomputing the path per limit.
+    Rows are processed in blocks of at most max_cells array cells to keep
+    memory bounded on long histories.
+
+    Returns one row per combination with Sharpe, max drawdown and final
+    equity, matching sharpe_ratio / max_drawdown on backtest_strategy output.
+    """
+
+    df = df.dropna(subset=["return", "volatility", "prediction", "confidence"])
+
+    ret = df["return"].to_numpy(dtype=float)
+    vol = df["volatility"].to_numpy(dtype=float)
+    pred = df["prediction"].to_numpy()
+    conf = df["confidence"].to_numpy(dtype=float)
+
+    limits = np.asarray(max_drawdown_limits, dtype=float)
+
+    # (conf_threshold, cost) pairs, one per row
+    thr, cst = np.meshgrid(
+        np.asarray(conf_thresholds, dtype=float),
+        np.asarray(costs, dtype=float),
+        indexing="ij"
     )
+    thr, cst = thr.ravel(), cst.ravel()
 
-    # Transaction cost proportional to exposure
-    df["strategy_return"] -= cost * df["position_size"]
+    # Parameter-independent series
+    with np.errstate(divide="ignore"):
+        base_position = np.where(vol != 0, 1 / vol, 0.0)
+    base_position = np.minimum(base_position, 3)
 
-    # ===============================
-    # Cumulative returns
-    # ===============================
-    df["cum_strategy"] = (1 + df["strategy_return"]).cumprod()
-    df["cum_market"] = (1 + df["return"]).cumprod()
+    direction = np.where(pred == 1, 1.0, np.where(pred == 0, -1.0, 0.0))
+    signed_return = direction * ret
 
-    # ===============================
-    # Drawdown calculation
-    # ===============================
-    df["peak"] = df["cum_strategy"].cummax()
-    df["drawdown"] = (df["peak"] - df["cum_strategy"]) / df["peak"]
+    n_pairs, n_limits, n_bars = len(thr), len(limits), len(ret)
 
-    # ===============================
-    # Drawdown-based stop trading rule
-    # ===============================
-    stop_idx = df[df["drawdown"] > max_drawdown_limit].index
+    sharpe = np.zeros((n_pairs, n_limits))
+    mdd = np.zeros((n_pairs, n_limits))
+    final_equity = np.ones((n_pairs, n_limits))
+
+    if n_bars > 0:
+        step = max(1, max_cells // n_bars)
+
+        for lo in range(0, n_pairs, step):
+            hi = min(lo + step, n_pairs)
+            rows = np.arange(hi - lo)[:, None]
+            t = thr[lo:hi, None]
+
+            conf_weight = np.clip((conf - t) / (1 - t), 0, 1)
+            position_size = base_position * conf_weight
+
+            strategy_return = position_size * (signed_return - cst[lo:hi, None])
+
+            # Unstopped path and its running worst drawdown
+            cum = np.cumprod(1 + strategy_return, axis=1)
+            worst = 1 - cum / np.maximum.accumulate(cum, axis=1)
+            np.maximum.accumulate(worst, axis=1, out=worst)
+
+            sums = np.cumsum(strategy_return, axis=1)
+            squares = np.cumsum(strategy_return * strategy_return, axis=1)
+
+            for k, limit in enumerate(limits):
+                # Trade through the breaching bar, flat afterwards: the
+                # stopped path is the unstopped one up to that bar
+                end = np.minimum((worst <= limit).sum(axis=1), n_bars - 1)[:, None]
+
+                mean = np.take_along_axis(sums, end, axis=1)[:, 0] / n_bars
+                sq = np.take_along_axis(squares, end, axis=1)[:, 0]
 
-    if len(stop_idx) > 0:
-        first_stop = stop_idx[0]
+                if n_bars > 1:
+                    std = np.sqrt(np.maximum(sq - n_bars * mean * mean, 0.0) / (n_bars - 1))
+                else:
+                    std = np.zeros(hi - lo)
 
-        # Stop all trading after drawdown breach
-        df.loc[first_stop:, "strategy_return"] = 0.0
-        df.loc[first_stop:, "position_size"] = 0.0
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    sharpe[lo:hi, k] = np.where(std == 0, 0.0, mean / std * np.sqrt(252))
 
-        # Recompute equity curve correctly
-        df["cum_strategy"] = (1 + df["strategy_return"]).cumprod()
+                mdd[lo:hi, k] = -worst[rows, end][:, 0]
+                final_equity[lo:hi, k] = cum[rows, end][:, 0]
 
-    return df
+    return pd.DataFrame({
+        "conf_threshold": np.repeat(thr, n_limits),
+        "cost": np.repeat(cst, n_limits),
+        "max_drawdown_limit": np.tile(limits, n_pairs),
+        "sharpe": sharpe.ravel(),
+        "max_drawdown": mdd.ravel(),
+        "final_equity": final_equity.ravel()
+    })
@@ -0,0 +1,369 @@
+"""
+Headless multi-symbol batch runner.
+
+Runs the full pipeline (market data -> features -> walk-forward ->
+backtest -> risk metrics) for a list of symbols concurrently and streams
+one summary row per symbol to CSV or Parquet as each one finishes.
+
+Usage:
+    python -m core.batch AAPL MSFT TSLA -o summary.csv
+    python -m core.batch -f universe.txt -o summary.parquet --model rf --news
+    python -m core.batch AAPL MSFT -o summary.csv --reports reports/
+    python -m core.batch -f universe.txt -o summary.csv --news --prefetch
+    python -m core.batch AAPL MSFT -o summary.csv --profile profile.json
+"""
+
+import argparse
+import csv
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from core import profiling
+from core.acquisition import fetch_all
+from core.fetch_market_data import fetch_market_data
+from core.fetch_news import fetch_news, news_query, news_sentiment
+from core.feature_engineering import create_features
+from core.features import DEFAULT_FEATURES
+from core.sentiment_series import articles_frame
+from core.walk_forward import walk_forward_validation
+from core.ml_model import CALIBRATION_METHODS, MODELS, model_name
+from core.model_store import ModelStore
+from core.backtest import backtest_strategy
+from core.risk_metrics import sharpe_ratio, max_drawdown
+from core.trading_signal import generate_signal
+from core.report_assets import report_charts
+from core.report_generator import generate_research_report
+
+SUMMARY_COLUMNS = [
+    "symbol", "status", "model", "bars", "last_close", "sentiment",
+    "prediction", "confidence", "signal",
+    "sharpe", "max_drawdown", "final_equity", "market_return", "report", "error"
+]
+
+
+
+def analyze_symbol(symbol, period="1y", model_type="lr", with_news=False, cost=0.001,
+                   features=None, report_dir=None, calibration=None, store_models=False):
+    """
+    Run the pipeline for one symbol and return a flat summary dict.
+    Failures are reported in the row instead of raised, so one bad
+    symbol never stops a batch.
+
+    report_dir: also render the research PDF into this directory
+    (charts are drawn in memory on the Agg canvas).
+    calibration: probability calibration for the model (see ml_model.build_model)
+    store_models: reuse fitted models from the shared on-disk ModelStore
+    (writes one artifact per refit, so it is off by default)
+    """
+
+    row = dict.fromkeys(SUMMARY_COLUMNS)
+    row["symbol"] = symbol
+
+    try:
+        row["model"] = model_name(model_type, calibration)
+
+        data = fetch_market_data(symbol, period)
+
+        if data is None or data.empty:
+            row["status"] = "no_data"
+            return row
+
+        data = data[data["close"] > 0]
+
+        sentiment = 0.0
+        news_df = None
+        if with_news:
+            articles = fetch_news(news_query(symbol))
+            scores = news_sentiment(articles)
+            if scores:
+                sentiment = sum(scores) / len(scores)
+                news_df = articles_frame(articles, scores)
+
+        features = features or DEFAULT_FEATURES
+        features_df = create_features(data, sentiment, news_df=news_df, features=features)
+        wf_df = walk_forward_validation(
+            features_df, model_type, features=features,
+            store=ModelStore() if store_models else None, symbol=symbol, calibration=calibration
+        )
+
+        prediction = wf_df["prediction"].iloc[-1]
+        confidence = wf_df["confidence"].iloc[-1]
+
+        row["bars"] = len(data)
+        row["last_close"] = float(data["close"].iloc[-1])
+        row["sentiment"] = sentiment
+
+        if wf_df["prediction"].isna().all():
+            row["status"] = "insufficient_data"
+            return row
+
+        bt_df = backtest_strategy(wf_df, cost=cost)
+
+        row["prediction"] = prediction
+        row["confidence"] = confidence
+        row["signal"] = generate_signal(prediction, confidence, threshold=0.60)
+        row["sharpe"] = float(sharpe_ratio(bt_df["strategy_return"]))
+        row["max_drawdown"] = float(max_drawdown(bt_df["cum_strategy"]))
+        row["final_equity"] = float(bt_df["cum_strategy"].iloc[-1])
+        row["market_return"] = float(bt_df["cum_market"].iloc[-1] - 1)
+
+        if report_dir:
+            row["report"] = write_report(
+                bt_df, os.path.join(report_dir, f"{symbol}_research_report.pdf"),
+                symbol, row["model"],
+                prediction, row["signal"], row["sharpe"], row["max_drawdown"]
+            )
+
+        row["status"] = "ok"
+
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = str(e)
+
+    return row
+
+
+def write_report(bt_df, filename, symbol, model_name, prediction, signal, sharpe, drawdown):
+    """Render the research PDF for a backtest to filename (path or buffer)."""
+
+    charts = report_charts(bt_df)
+
+    return generate_research_report(
+        filename=filename,
+        symbol=symbol,
+        model_name=model_name,
+        prediction="Bullish" if prediction == 1 else "Bearish",
+        signal=signal,
+        sharpe=sharpe,
+        drawdown=drawdown,
+        equity_curve_path=charts["equity_curve"],
+        prediction_distribution=charts["prediction_distribution"],
+        trade_outcomes=charts["trade_outcomes"]
+    )
+
+
+def _analyze_profiled(symbol, **kwargs):
+    """analyze_symbol in a pool worker, returning the row and its stage stats."""
+
+    # Workers are reused across symbols, so each call reports only its own stages
+    profiling.enable()
+    profiling.reset()
+
+    try:
+        row = analyze_symbol(symbol, **kwargs)
+    finally:
+        stats = profiling.snapshot()
+        profiling.disable()
+
+    return row, stats
+
+
+def iter_batch(symbols, max_workers=None, profile=False, **kwargs):
+    """
+    Analyze symbols on a process pool and yield summary rows in
+    completion order. At most 2 * max_workers symbols are in flight, so
+    memory stays flat regardless of the universe size.
+
+    profile: profile every worker and merge its stage stats into this
+    process (read them with profiling.report() / export()).
+    """
+
+    max_workers = max_workers or os.cpu_count() or 1
+
+    def result(future):
+        if not profile:
+            return future.result()
+
+        row, stats = future.result()
+        profiling.merge(stats)
+        return row
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        pending = set()
+
+        for symbol in symbols:
+            if profile:
+                pending.add(pool.submit(_analyze_profiled, symbol, **kwargs))
+            else:
+                pending.add(pool.submit(analyze_symbol, symbol, **kwargs))
+
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    yield result(future)
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield result(future)
+
+
+class _CsvSink:
+
+    def __init__(self, path):
+        self.file = open(path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=SUMMARY_COLUMNS)
+        self.writer.writeheader()
+
+    def write(self, row):
+        self.writer.writerow(row)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class _ParquetSink:
+    """Buffers a few rows per Parquet row group (requires pyarrow)."""
+
+    def __init__(self, path, rows_per_group=64):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet output requires pyarrow (pip install pyarrow)")
+
+        self.pa = pa
+        self.schema = pa.schema([
+            (c, pa.string() if c in ("symbol", "status", "model", "signal", "report", "error") else pa.float64())
+            for c in SUMMARY_COLUMNS
+        ])
+        self.writer = pq.ParquetWriter(path, self.schema)
+        self.rows_per_group = rows_per_group
+        self.buffer = []
+
+    def write(self, row):
+        self.buffer.append(row)
+        if len(self.buffer) >= self.rows_per_group:
+            self._flush()
+
+    def _flush(self):
+        if self.buffer:
+            table = self.pa.Table.from_pylist(self.buffer, schema=self.schema)
+            self.writer.write_table(table)
+            self.buffer = []
+
+    def close(self):
+        self._flush()
+        self.writer.close()
+
+
+def run_batch(symbols, output, period="1y", model_type="lr", with_news=False,
+              cost=0.001, max_workers=None, features=None, report_dir=None,
+              prefetch=False, calibration=None, profile_path=None, store_models=False):
+    """
+    Screen a symbol universe and stream the summaries to output
+    (.csv or .parquet). Returns the number of rows written.
+
+    report_dir: also render one research PDF per symbol there, on the
+    same process pool.
+    prefetch: first download all prices (and news) concurrently with the
+    rate-limited async acquisition layer, so the workers read warm caches.
+    profile_path: collect the per-stage timings of every worker and export
+    them there (.json or .csv) when the batch finishes.
+    store_models: let the workers reuse fitted models from the ModelStore.
+    """
+
+    if profile_path:
+        profiling.reset()
+
+    if prefetch:
+        fetched = fetch_all(symbols, period=period, with_news=with_news)
+        failed = sum(1 for r in fetched.values() if r["errors"])
+        print(f"Prefetched {len(fetched)} symbols ({failed} with errors)", file=sys.stderr)
+
+    if report_dir:
+        os.makedirs(report_dir, exist_ok=True)
+
+    if str(output).endswith(".parquet"):
+        sink = _ParquetSink(output)
+    else:
+        sink = _CsvSink(output)
+
+    count = 0
+
+    try:
+        for row in iter_batch(
+            symbols,
+            max_workers=max_workers,
+            period=period,
+            model_type=model_type,
+            with_news=with_news,
+            cost=cost,
+            features=features,
+            report_dir=report_dir,
+            calibration=calibration,
+            store_models=store_models,
+            profile=bool(profile_path)
+        ):
+            sink.write(row)
+            count += 1
+            print(f"[{count}] {row['symbol']}: {row['status']}", file=sys.stderr)
+    finally:
+        sink.close()
+
+    if profile_path:
+        profiling.export(profile_path)
+
+    return count
+
+
+def _read_symbols(args):
+    symbols = list(args.symbols)
+
+    if args.file:
+        with open(args.file, encoding="utf-8") as f:
+            symbols += [line.strip() for line in f if line.strip() and not line.startswith("#")]
+
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(s.strip() for s in symbols))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Batch market sentiment screener")
+    parser.add_argument("symbols", nargs="*", help="Symbols to analyze")
+    parser.add_argument("-f", "--file", help="Text file with one symbol per line")
+    parser.add_argument("-o", "--output", default="summary.csv", help=".csv or .parquet output path")
+    parser.add_argument("--period", default="1y")
+    parser.add_argument("--model", default="lr", choices=list(MODELS))
+    parser.add_argument("--calibrate", choices=CALIBRATION_METHODS, help="Calibrate model probabilities")
+    parser.add_argument("--news", action="store_true", help="Include news sentiment")
+    parser.add_argument("--cost", type=float, default=0.001)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument(
+        "--features",
+        help="Comma-separated model features (default: %s)" % ",".join(DEFAULT_FEATURES)
+    )
+    parser.add_argument("--reports", metavar="DIR", help="Also write a research PDF per symbol to DIR")
+    parser.add_argument("--prefetch", action="store_true",
+                        help="Download all data concurrently before analysis")
+    parser.add_argument("--store-models", action="store_true",
+                        help="Reuse fitted models from the on-disk model store")
+    parser.add_argument("--profile", metavar="PATH",
+                        help="Write per-stage timings of all workers to PATH (.json or .csv)")
+    args = parser.parse_args(argv)
+
+    symbols = _read_symbols(args)
+    if not symbols:
+        parser.error("no symbols given")
+
+    run_batch(
+        symbols,
+        args.output,
+        period=args.period,
+        model_type=args.model,
+        with_news=args.news,
+        cost=args.cost,
+        max_workers=args.workers,
+        features=args.features.split(",") if args.features else None,
+        report_dir=args.reports,
+        prefetch=args.prefetch,
+        calibration=args.calibrate,
+        profile_path=args.profile,
+        store_models=args.store_models
+    )
+
+
+if __name__ == "__main__":
+    main()
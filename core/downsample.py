@@ -0,0 +1,114 @@
+"""
+Server-side downsampling of chart series to a point budget.
+
+- lttb / lttb_indices: Largest-Triangle-Three-Buckets for line series.
+  Keeps the first and last points and, per bucket, the point that spans
+  the largest triangle with its neighbours, so peaks, troughs and
+  drawdowns survive the reduction.
+- downsample_ohlc: re-aggregates consecutive bars into coarser candles
+  (first open, max high, min low, last close, summed volume), so a
+  candlestick chart keeps every extreme.
+
+Series at or under the budget are returned unchanged.
+"""
+
+import numpy as np
+import pandas as pd
+
+# Default number of points sent to a chart
+DEFAULT_POINTS = 2000
+
+
+def _numeric(x):
+    """Float x positions; datetimes become seconds."""
+
+    x = pd.Series(x)
+    if isinstance(x.dtype, pd.DatetimeTZDtype):
+        x = x.dt.tz_convert(None)
+
+    if pd.api.types.is_datetime64_dtype(x):
+        return x.astype("datetime64[s]").to_numpy().view(np.int64).astype(float)
+
+    return x.to_numpy(dtype=float)
+
+
+def lttb_indices(x, y, max_points=DEFAULT_POINTS):
+    """Positions of the points LTTB keeps (sorted, first and last included)."""
+
+    y = np.asarray(y, dtype=float)
+    n = len(y)
+
+    if max_points is None or n <= max_points or max_points < 3:
+        return np.arange(n)
+
+    x = _numeric(x)
+
+    # n - 2 interior points split into max_points - 2 buckets
+    edges = np.linspace(1, n - 1, max_points - 1).astype(np.int64)
+
+    keep = np.empty(max_points, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+
+    for b in range(max_points - 2):
+        lo, hi = edges[b], edges[b + 1]
+
+        # Average of the next bucket (the last point for the final bucket)
+        nlo = hi
+        nhi = edges[b + 2] if b + 2 < len(edges) else n
+        avg_x = x[nlo:nhi].mean()
+        avg_y = y[nlo:nhi].mean()
+
+        area = np.abs(
+            (x[a] - avg_x) * (y[lo:hi] - y[a])
+            - (x[a] - x[lo:hi]) * (avg_y - y[a])
+        )
+
+        a = lo + int(np.argmax(area))
+        keep[b + 1] = a
+
+    return keep
+
+
+def lttb(x, y, max_points=DEFAULT_POINTS):
+    """(x, y) reduced to at most max_points with LTTB; pandas inputs stay pandas."""
+
+    idx = lttb_indices(x, y, max_points)
+
+    def take(values):
+        if isinstance(values, pd.Series):
+            return values.iloc[idx]
+        if isinstance(values, pd.Index):
+            return values[idx]
+        return np.asarray(values)[idx]
+
+    return take(x), take(y)
+
+
+def downsample_ohlc(df, max_bars=DEFAULT_POINTS):
+    """
+    Re-aggregate an OHLC frame ('datetime', 'open', 'high', 'low',
+    'close', optional 'volume') into at most max_bars candles of
+    consecutive bars. Each candle is stamped with its first bar's time.
+    """
+
+    n = len(df)
+    if max_bars is None or n <= max_bars:
+        return df
+
+    k = -(-n // max_bars)
+    starts = np.arange(0, n, k)
+    ends = np.minimum(starts + k, n) - 1
+
+    out = {
+        "datetime": df["datetime"].iloc[starts].reset_index(drop=True),
+        "open": df["open"].to_numpy()[starts],
+        "high": np.maximum.reduceat(df["high"].to_numpy(), starts),
+        "low": np.minimum.reduceat(df["low"].to_numpy(), starts),
+        "close": df["close"].to_numpy()[ends],
+    }
+
+    if "volume" in df.columns:
+        out["volume"] = np.add.reduceat(df["volume"].to_numpy(), starts)
+
+    return pd.DataFrame(out)
@@ -1,14 +1,38 @@
 import pandas as pd
 
-def create_features(price_df, sentiment_score):
-    df = price_df.copy()
+from core.features import DEFAULT_FEATURES, FEATURES, compute_features
+from core.profiling import profiled
+from core.sentiment_series import sentiment_features
 
-    df['return'] = df['close'].pct_change()
-    df['volatility'] = df['return'].rolling(3).std()
-    df['sentiment'] = sentiment_score
+@profiled("features")
+def create_features(price_df, sentiment_score=0.0, news_df=None, features=DEFAULT_FEATURES):
+    """
+    Build model features from OHLC bars.
 
-    # 🎯 TARGET: next-day direction
-    df['target'] = (df['return'].shift(-1) > 0).astype(int)
+    Only the requested registry features (plus 'return', 'volatility' and
+    'target', which the backtest and models always need) are computed,
+    and they are joined onto the bars in a single concat.
 
-    df = df.dropna()
+    sentiment_score fills a constant 'sentiment' column. When news_df
+    (published_at, polarity per article) is given instead, a per-bar
+    sentiment series is joined onto the bars as of each bar's timestamp.
+    """
+    names = list(dict.fromkeys(
+        ["return", "volatility"] + [f for f in features if f in FEATURES] + ["target"]
+    ))
+    computed = compute_features(price_df, names)
+
+    if news_df is not None:
+        sentiment = sentiment_features(price_df['datetime'], news_df)
+        sentiment.index = price_df.index
+    else:
+        sentiment = pd.DataFrame({'sentiment': sentiment_score}, index=price_df.index)
+
+    df = pd.concat([price_df, computed, sentiment], axis=1)
+
+    missing = [f for f in features if f not in df.columns]
+    if missing:
+        raise KeyError(f"Unknown features: {missing}")
+
+    df = df.dropna(subset=list(dict.fromkeys(names + list(features))))
     return df
@@ -0,0 +1,164 @@
+"""
+Feature registry.
+
+Each feature is a vectorized transform declared with the columns it
+depends on (raw OHLCV columns or other registered features). Only the
+requested features and their dependencies are computed, each exactly once,
+and the results are assembled into a single frame at the end.
+
+Register new features with the @feature decorator:
+
+    @feature("range_pct", requires=("high", "low", "close"))
+    def _range_pct(c):
+        return (c["high"] - c["low"]) / c["close"]
+"""
+
+import numpy as np
+import pandas as pd
+
+FEATURES = {}
+
+# Model inputs used when a caller does not ask for specific features
+DEFAULT_FEATURES = ["return", "volatility", "sentiment"]
+
+
+def feature(name, requires=()):
+    """Register fn(columns) -> Series as feature name."""
+
+    def register(fn):
+        FEATURES[name] = (fn, tuple(requires))
+        return fn
+
+    return register
+
+
+def resolve(names):
+    """Registered features needed for names, dependencies first."""
+
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order or name not in FEATURES:
+            return
+        if name in visiting:
+            raise ValueError(f"Circular feature dependency at '{name}'")
+
+        visiting.add(name)
+        for dep in FEATURES[name][1]:
+            visit(dep)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        if name not in FEATURES:
+            raise KeyError(f"Unknown feature: {name}")
+        visit(name)
+
+    return order
+
+
+def compute_features(df, names):
+    """
+    Compute the requested features for an OHLCV frame.
+    Returns a new frame (same index) holding only the requested columns.
+    """
+
+    columns = {}
+
+    for name in resolve(names):
+        fn, requires = FEATURES[name]
+
+        for dep in requires:
+            if dep not in columns:
+                if dep not in df.columns:
+                    raise KeyError(f"Feature '{name}' requires column '{dep}'")
+                columns[dep] = df[dep]
+
+        columns[name] = fn(columns)
+
+    return pd.DataFrame({name: columns[name] for name in names}, index=df.index)
+
+
+# ===============================
+# Returns & momentum
+# ===============================
+
+@feature("return", requires=("close",))
+def _return(c):
+    return c["close"].pct_change()
+
+
+@feature("log_return", requires=("close",))
+def _log_return(c):
+    return np.log(c["close"]).diff()
+
+
+for _w in (5, 10, 20):
+    feature(f"return_{_w}", requires=("close",))(
+        lambda c, w=_w: c["close"].pct_change(w)
+    )
+
+
+# ===============================
+# Volatility & range
+# ===============================
+
+@feature("volatility", requires=("return",))
+def _volatility(c):
+    return c["return"].rolling(3).std()
+
+
+for _w in (10, 20):
+    feature(f"volatility_{_w}", requires=("return",))(
+        lambda c, w=_w: c["return"].rolling(w).std()
+    )
+
+
+@feature("true_range", requires=("high", "low", "close"))
+def _true_range(c):
+    prev_close = c["close"].shift(1)
+    ranges = np.maximum(
+        c["high"] - c["low"],
+        np.maximum((c["high"] - prev_close).abs(), (c["low"] - prev_close).abs())
+    )
+    # First bar has no previous close
+    return ranges.fillna(c["high"] - c["low"])
+
+
+@feature("atr_14", requires=("true_range",))
+def _atr_14(c):
+    return c["true_range"].ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+
+
+# ===============================
+# Oscillators & normalization
+# ===============================
+
+@feature("rsi_14", requires=("close",))
+def _rsi_14(c):
+    delta = c["close"].diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / 14, adjust=False, min_periods=14).mean()
+    return 100 - 100 / (1 + gain / loss)
+
+
+@feature("zscore_20", requires=("close",))
+def _zscore_20(c):
+    rolling = c["close"].rolling(20)
+    return (c["close"] - rolling.mean()) / rolling.std()
+
+
+@feature("volume_ratio_20", requires=("volume",))
+def _volume_ratio_20(c):
+    return c["volume"] / c["volume"].rolling(20).mean()
+
+
+# ===============================
+# Target
+# ===============================
+
+@feature("target", requires=("return",))
+def _target(c):
+    # 🎯 TARGET: next-day direction
+    return (c["return"].shift(-1) > 0).astype(int)
@@ -1,33 +1,235 @@
+import time
+
 import yfinance as yf
 import pandas as pd
 
-def fetch_market_data(symbol, period="1mo"):
-    try:
+from core.market_cache import OHLCCache
+from core.profiling import profiled
+
+OHLC_COLUMNS = ['datetime', 'open', 'high', 'low', 'close']
+
+# Seconds a cached key is served without asking the source for new bars
+CACHE_MAX_AGE = 300
+
+_PERIOD_UNITS = {"d": "days", "wk": "weeks", "mo": "months", "y": "years"}
+
+# Periods anchored to a fixed first bar; the others roll forward with new bars
+_ANCHORED_PERIODS = (None, "max", "ytd")
+
+_default_cache = None
+
+
+def normalize_ohlc(df):
+    """Normalize a raw history frame to datetime + numeric OHLC(V) columns."""
+
+    df = df.reset_index()
+
+    # Normalize column names
+    df.columns = [c.lower() for c in df.columns]
+
+    # Rename date column
+    if 'date' in df.columns:
+        df.rename(columns={'date': 'datetime'}, inplace=True)
+
+    # Keep only required columns
+    keep = OHLC_COLUMNS + (['volume'] if 'volume' in df.columns else [])
+    df = df[keep]
+
+    # Ensure numeric
+    for col in keep[1:]:
+        df[col] = pd.to_numeric(df[col], errors='coerce')
+
+    return df.dropna(subset=OHLC_COLUMNS)
+
+
+class YahooSource:
+    """Yahoo Finance bar source."""
+
+    def history(self, symbol, interval="1d", period=None, start=None):
         ticker = yf.Ticker(symbol)
-        df = ticker.history(period=period)
+
+        if start is not None:
+            df = ticker.history(start=start, interval=interval)
+        else:
+            df = ticker.history(period=period, interval=interval)
 
         if df.empty:
             return None
 
-        df = df.reset_index()
+        return normalize_ohlc(df)
+
+
+class FrameSource:
+    """
+    Local stand-in source serving bars from in-memory DataFrames,
+    e.g. for tests and offline replays. Records every request in calls.
+    """
+
+    def __init__(self, frames):
+        self.frames = frames
+        self.calls = []
+
+    def history(self, symbol, interval="1d", period=None, start=None):
+        self.calls.append((symbol, interval, period, start))
+
+        df = self.frames.get(symbol)
+        if df is None or df.empty:
+            return None
+
+        if start is None and period not in (None, "max"):
+            start = _period_start(period, df["datetime"])
+        if start is not None:
+            df = df[df["datetime"] >= start]
+
+        return df.reset_index(drop=True)
+
+
+def _period_start(period, datetimes):
+    """
+    Start timestamp of a yfinance-style period ending at the last of
+    datetimes (None = max). Like Yahoo, "Nd" counts N trading sessions,
+    not calendar days.
+    """
+
+    if period in (None, "max"):
+        return None
+
+    now = datetimes.iloc[-1]
+
+    if period == "ytd":
+        return now.normalize().replace(month=1, day=1)
 
-        # Normalize column names
-        df.columns = [c.lower() for c in df.columns]
+    for suffix, unit in _PERIOD_UNITS.items():
+        if period.endswith(suffix) and period[:-len(suffix)].isdigit():
+            n = int(period[:-len(suffix)])
 
-        # Rename date column
-        if 'date' in df.columns:
-            df.rename(columns={'date': 'datetime'}, inplace=True)
+            if suffix == "d":
+                sessions = datetimes.dt.normalize().unique()
+                return sessions[max(len(sessions) - n, 0)]
 
-        # Keep only required columns
-        df = df[['datetime', 'open', 'high', 'low', 'close']]
+            return now - pd.DateOffset(**{unit: n})
 
-        # Ensure numeric
-        for col in ['open', 'high', 'low', 'close']:
-            df[col] = pd.to_numeric(df[col], errors='coerce')
+    raise ValueError(f"Unsupported period: {period}")
 
-        df = df.dropna()
 
-        return df
+def get_default_cache():
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = OHLCCache()
+
+    return _default_cache
+
+
+def cache_stats():
+    """Hit / miss / incremental refresh counters of the default cache."""
+    return dict(get_default_cache().stats)
+
+
+def _last_bar(cache, symbol, interval, tz):
+    """Last cached bar time in the timezone the source used."""
+
+    last = pd.Timestamp(cache.last_timestamp(symbol, interval))
+    return last.tz_localize("UTC").tz_convert(tz) if tz else last
+
+
+def _fetch_cached(symbol, period, interval, source, cache, max_age):
+    meta = cache.meta(symbol, interval)
+    window = cache.period_range(symbol, interval, period)
+
+    if meta is not None and window is not None and period == "ytd":
+        # A new year starts a new window
+        start_year = pd.Timestamp(window["start"]).year
+        if _last_bar(cache, symbol, interval, "UTC").year != start_year:
+            window = None
+
+    if meta is None or window is None:
+        # This period was never fetched: ask the source for it, and keep
+        # the window it returned instead of recomputing it from the clock
+        cache.count("misses")
+        df = source.history(symbol, interval=interval, period=period)
+
+        if df is None or df.empty:
+            return None
+
+        cache.store(symbol, interval, df)
+        cache.store_range(symbol, interval, period, df)
+        window = cache.period_range(symbol, interval, period)
+
+    elif time.time() - meta["fetched_at"] > max_age:
+        # Ask only for bars since the last cached one (the last bar is
+        # re-fetched because it may still have been forming)
+        cache.count("refreshes")
+        last = _last_bar(cache, symbol, interval, meta["tz"])
+        df = source.history(symbol, interval=interval, start=last)
+
+        if df is not None and not df.empty:
+            cache.store(symbol, interval, df)
+        else:
+            cache.touch(symbol, interval)
+
+    else:
+        cache.count("hits")
+
+    if period in _ANCHORED_PERIODS:
+        return cache.load(symbol, interval, start=window["start"])
+
+    # Rolling periods keep as many bars as the source returned, so the
+    # window slides forward as new bars arrive
+    return cache.load(symbol, interval, start=window["start"], last=window["bars"])
+
+
+def fetch_bars(
+    symbol,
+    period="1mo",
+    interval="1d",
+    source=None,
+    cache=None,
+    use_cache=True,
+    max_age=CACHE_MAX_AGE
+):
+    """fetch_market_data without the error handling: source errors propagate."""
+
+    source = source or YahooSource()
+
+    if use_cache:
+        df = _fetch_cached(
+            symbol, period, interval, source,
+            cache or get_default_cache(), max_age
+        )
+    else:
+        df = source.history(symbol, interval=interval, period=period)
+
+    if df is None or df.empty:
+        return None
+
+    df = df[[c for c in OHLC_COLUMNS + ['volume'] if c in df.columns]]
+    df = df.dropna(subset=OHLC_COLUMNS)
+
+    return df.reset_index(drop=True)
+
+
+@profiled("fetch.market_data")
+def fetch_market_data(
+    symbol,
+    period="1mo",
+    interval="1d",
+    source=None,
+    cache=None,
+    use_cache=True,
+    max_age=CACHE_MAX_AGE
+):
+    """
+    Fetch OHLC bars for symbol over period.
+
+    Bars are served from the on-disk cache when possible; only bars newer
+    than the last cached timestamp are requested once the cached copy is
+    older than max_age seconds. source defaults to Yahoo Finance and may be
+    any object with a history(symbol, interval, period, start) method.
+    """
+
+    try:
+        return fetch_bars(symbol, period, interval, source, cache, use_cache, max_age)
 
     except Exception as e:
         print("Market data error:", e)
@@ -1,18 +1,129 @@
+import os
+import threading
+
 from newsapi import NewsApiClient
+from newsapi.newsapi_exception import NewsAPIException
 
-NEWS_API_KEY = "85ee2bd2e1154ca9b865f97ebf666a77"
+from core.http import call_with_retries, is_transient, thread_session
+from core.news_cache import NewsCache, dedupe_articles
+from core.profiling import profiled
 
-newsapi = NewsApiClient(api_key=NEWS_API_KEY)
+# Seconds a query result is served from the article store
+NEWS_TTL = 900
 
-def fetch_news(query, page_size=10):
-    try:
-        articles = newsapi.get_everything(
+# Attempts after the first on rate limiting / transient failures
+NEWS_RETRIES = 3
+
+# NewsAPI error codes worth retrying
+_RETRY_CODES = ("rateLimited", "unexpectedError")
+
+_local = threading.local()
+_default_cache = None
+
+
+def news_query(symbol):
+    """News search query for a market symbol (crypto pairs drop '-USD')."""
+    return symbol.replace("-USD", "")
+
+
+def get_api_key():
+    """NewsAPI key from the NEWS_API_KEY environment variable."""
+
+    key = os.environ.get("NEWS_API_KEY")
+    if not key:
+        raise RuntimeError("NEWS_API_KEY is not set")
+    return key
+
+
+def get_client(api_key=None):
+    """Per-thread NewsAPI client on the thread's pooled HTTP session."""
+
+    api_key = api_key or get_api_key()
+    client = getattr(_local, "client", None)
+
+    if client is None or _local.api_key != api_key:
+        client = _local.client = NewsApiClient(api_key=api_key, session=thread_session())
+        _local.api_key = api_key
+
+    return client
+
+
+def is_retryable(exc):
+    """Rate limiting, NewsAPI server errors and transient HTTP failures."""
+
+    if isinstance(exc, NewsAPIException):
+        return exc.get_exception().get("code") in _RETRY_CODES
+    return is_transient(exc)
+
+
+def get_default_cache():
+    global _default_cache
+
+    if _default_cache is None:
+        _default_cache = NewsCache()
+
+    return _default_cache
+
+
+def fetch_articles(query, page_size=10, ttl=NEWS_TTL, cache=None, use_cache=True,
+                   api_key=None, retries=NEWS_RETRIES):
+    """fetch_news without the error handling: request errors propagate after retries."""
+
+    cache = (cache or get_default_cache()) if use_cache else None
+
+    if cache is not None:
+        cached = cache.get_query(query, page_size, ttl)
+        if cached is not None:
+            cache.count("hits")
+            return cached
+        cache.count("misses")
+
+    client = get_client(api_key)
+    response = call_with_retries(
+        lambda: client.get_everything(
             q=query,
             language="en",
             sort_by="relevancy",
             page_size=page_size
-        )
-        return articles["articles"]
+        ),
+        retries=retries,
+        retryable=is_retryable
+    )
+    articles = dedupe_articles(response["articles"])
+
+    if cache is not None:
+        cache.put_query(query, page_size, articles)
+
+    return articles
+
+
+@profiled("fetch.news")
+def fetch_news(query, page_size=10, ttl=NEWS_TTL, cache=None, use_cache=True, api_key=None):
+    """
+    Fetch deduplicated articles for query.
+    Results are served from the persistent article store for ttl seconds.
+
+    Requests go through a pooled session and are retried with backoff on
+    rate limiting and transient errors. api_key defaults to the
+    NEWS_API_KEY environment variable.
+    """
+
+    try:
+        return fetch_articles(query, page_size, ttl, cache, use_cache, api_key)
     except Exception as e:
         print("News fetch error:", e)
         return []
+
+
+@profiled("sentiment.news")
+def news_sentiment(articles, score_texts=None, cache=None):
+    """
+    Sentiment polarity per article, reusing stored scores so unchanged
+    articles are never rescored. score_texts defaults to score_batch.
+    """
+
+    if score_texts is None:
+        from core.sentiment import score_batch
+        score_texts = score_batch
+
+    return (cache or get_default_cache()).polarities(articles, score_texts)
@@ -0,0 +1,66 @@
+"""
+Shared HTTP plumbing for the data providers.
+
+- thread_session(): one pooled requests.Session per thread, so blocking
+  provider calls run from worker threads reuse keep-alive connections
+  without sharing a Session across threads
+- call_with_retries(): retry a call on transient errors with exponential
+  backoff and jitter
+"""
+
+import random
+import threading
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# Connections kept alive per host in each thread's session
+POOL_SIZE = 16
+
+_local = threading.local()
+
+
+def make_session(pool_size=POOL_SIZE):
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def thread_session():
+    """The calling thread's pooled session, created on first use."""
+
+    session = getattr(_local, "session", None)
+    if session is None:
+        session = _local.session = make_session()
+    return session
+
+
+def is_transient(exc):
+    """Connection problems, timeouts, HTTP 429 and 5xx responses."""
+
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None)
+    return status is not None and (status == 429 or status >= 500)
+
+
+def backoff_delay(attempt, base_delay=0.5, max_delay=30.0):
+    """Full-jitter exponential backoff for retry number attempt (0-based)."""
+    return random.uniform(0, min(max_delay, base_delay * 2 ** attempt))
+
+
+def call_with_retries(func, retries=3, base_delay=0.5, max_delay=30.0, retryable=is_transient):
+    """Call func(), retrying up to retries times while retryable(exc) holds."""
+
+    for attempt in range(retries + 1):
+        try:
+            return func()
+        except Exception as e:
+            if attempt == retries or not retryable(e):
+                raise
+            time.sleep(backoff_delay(attempt, base_delay, max_delay))
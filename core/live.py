@@ -0,0 +1,182 @@
+"""
+Streaming engine for live bar ingestion.
+
+OnlineEngine accepts one OHLC bar at a time and, in O(1) per bar:
+- realizes the bar with the position forecast at the previous close,
+  using the same sizing / cost rule as backtest_strategy, and advances
+  equity, peak, drawdown and the drawdown stop
+- updates the rolling 'return' / 'volatility' state
+- scores the new bar with the current model and turns the forecast into
+  a signal with generate_signal
+
+replay() feeds historical bars from a file or frame through an engine so
+the live path can be tested offline.
+"""
+
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from core.backtest import _bar_step
+from core.ml_model import FEATURE_COLUMNS
+from core.trading_signal import generate_signal
+
+# Rolling window of create_features' 'volatility'
+VOL_WINDOW = 3
+
+# Model inputs the engine can compute from one bar at a time
+LIVE_FEATURES = ("return", "volatility", "sentiment")
+
+
+class OnlineEngine:
+    """
+    features: the model's input columns (default FEATURE_COLUMNS), a
+    subset of LIVE_FEATURES; others raise ValueError up front.
+    """
+
+    def __init__(
+        self,
+        model,
+        sentiment=0.0,
+        cost=0.001,
+        conf_threshold=0.52,
+        max_drawdown_limit=0.30,
+        signal_threshold=0.60,
+        features=None
+    ):
+        features = list(features or FEATURE_COLUMNS)
+        unsupported = [f for f in features if f not in LIVE_FEATURES]
+        if unsupported:
+            raise ValueError(
+                f"OnlineEngine cannot compute features: {', '.join(unsupported)} "
+                f"(supported: {', '.join(LIVE_FEATURES)})"
+            )
+
+        self.model = model
+        self.features = features
+        self.sentiment = sentiment
+        self.cost = cost
+        self.conf_threshold = conf_threshold
+        self.max_drawdown_limit = max_drawdown_limit
+        self.signal_threshold = signal_threshold
+
+        # Rolling return window with running sums for O(1) std
+        self._returns = deque(maxlen=VOL_WINDOW)
+        self._sum = 0.0
+        self._sum_sq = 0.0
+        self._prev_close = None
+
+        # Forecast made at the previous close, traded on the next bar
+        self.prediction = np.nan
+        self.confidence = np.nan
+
+        self.equity = 1.0
+        self.market = 1.0
+        self.peak = None
+        self.drawdown = 0.0
+        self.stopped = False
+
+    def _push_return(self, ret):
+        if len(self._returns) == VOL_WINDOW:
+            old = self._returns[0]
+            self._sum -= old
+            self._sum_sq -= old * old
+
+        self._returns.append(ret)
+        self._sum += ret
+        self._sum_sq += ret * ret
+
+    def _volatility(self):
+        n = len(self._returns)
+        if n < VOL_WINDOW:
+            return np.nan
+
+        var = (self._sum_sq - self._sum * self._sum / n) / (n - 1)
+        return float(np.sqrt(max(var, 0.0)))
+
+    def update(self, bar):
+        """
+        Ingest one bar (mapping with 'close' and optionally 'datetime')
+        and return the engine state after it.
+        """
+
+        close = float(bar["close"])
+        ret = np.nan if self._prev_close is None else close / self._prev_close - 1
+        self._prev_close = close
+
+        if not np.isnan(ret):
+            self._push_return(ret)
+        volatility = self._volatility()
+
+        state = {
+            "datetime": bar.get("datetime"),
+            "close": close,
+            "return": ret,
+            "volatility": volatility,
+            "prediction": self.prediction,
+            "confidence": self.confidence,
+            "position_size": 0.0,
+            "strategy_return": 0.0,
+        }
+
+        # Realize this bar with the forecast from the previous close
+        tradable = not (np.isnan(ret) or np.isnan(volatility) or np.isnan(self.prediction))
+
+        if tradable:
+            if not self.stopped:
+                state["position_size"], state["strategy_return"] = _bar_step(
+                    ret, volatility, self.prediction, self.confidence,
+                    self.cost, self.conf_threshold
+                )
+
+            self.equity *= 1 + state["strategy_return"]
+            self.market *= 1 + ret
+            self.peak = self.equity if self.peak is None else max(self.peak, self.equity)
+            self.drawdown = (self.peak - self.equity) / self.peak
+
+            if self.drawdown > self.max_drawdown_limit:
+                self.stopped = True
+
+        state.update({
+            "cum_strategy": self.equity,
+            "cum_market": self.market,
+            "peak": self.peak if self.peak is not None else np.nan,
+            "drawdown": self.drawdown,
+        })
+
+        # Forecast the next bar from this bar's features
+        if np.isnan(volatility):
+            self.prediction, self.confidence = np.nan, np.nan
+        else:
+            values = {"return": ret, "volatility": volatility, "sentiment": self.sentiment}
+            x = np.array([[values[f] for f in self.features]])
+            self.confidence = float(self.model.predict_proba(x)[0, 1])
+            self.prediction = int(self.confidence > 0.5)
+
+        state["next_prediction"] = self.prediction
+        state["next_confidence"] = self.confidence
+        state["signal"] = generate_signal(
+            self.prediction,
+            None if np.isnan(self.confidence) else self.confidence,
+            threshold=self.signal_threshold
+        )
+
+        return state
+
+
+def replay(bars, engine):
+    """
+    Feed historical bars (CSV / Parquet path or DataFrame) through engine
+    one at a time. Returns the per-bar states as a DataFrame.
+    """
+
+    if isinstance(bars, str):
+        if bars.endswith(".parquet"):
+            bars = pd.read_parquet(bars)
+        else:
+            bars = pd.read_csv(bars, parse_dates=["datetime"])
+
+    states = [engine.update(bar) for bar in bars.to_dict("records")]
+    return pd.DataFrame(states)
+
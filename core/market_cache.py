@@ -0,0 +1,196 @@
+"""
+SQLite-backed OHLC bar cache keyed by (symbol, interval).
+
+Bars are stored as UTC nanosecond timestamps plus the original timezone,
+so a cached frame round-trips to exactly what the data source returned.
+Each key also records how far back the cached history reaches
+(covered_from) and when it was last refreshed (fetched_at). Every
+period requested for a key keeps the window the source returned for it
+(first bar and bar count), so reads are relative to the cached bars
+rather than to the wall clock.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import pandas as pd
+
+DEFAULT_CACHE_DIR = os.environ.get("MSA_CACHE_DIR", ".cache")
+
+BAR_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class OHLCCache:
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "ohlc.sqlite")
+
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "refreshes": 0}
+        self._lock = threading.Lock()
+
+        with self._connect() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS bars ("
+                "symbol TEXT, interval TEXT, ts INTEGER, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL, "
+                "PRIMARY KEY (symbol, interval, ts))"
+            )
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "symbol TEXT, interval TEXT, covered_from INTEGER, "
+                "fetched_at REAL, tz TEXT, "
+                "PRIMARY KEY (symbol, interval))"
+            )
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS ranges ("
+                "symbol TEXT, interval TEXT, period TEXT, start INTEGER, bars INTEGER, "
+                "PRIMARY KEY (symbol, interval, period))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def meta(self, symbol, interval):
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT covered_from, fetched_at, tz FROM meta WHERE symbol=? AND interval=?",
+                (symbol, interval)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {"covered_from": row[0], "fetched_at": row[1], "tz": row[2]}
+
+    def period_range(self, symbol, interval, period):
+        """Window the source returned for period: {"start": UTC ns, "bars": n} or None."""
+
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT start, bars FROM ranges WHERE symbol=? AND interval=? AND period=?",
+                (symbol, interval, str(period))
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return {"start": row[0], "bars": row[1]}
+
+    def store_range(self, symbol, interval, period, df):
+        """Record the window of bars the source returned for period."""
+
+        ts = pd.DatetimeIndex(df["datetime"]).as_unit("ns").asi8
+
+        with self._connect() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO ranges VALUES (?, ?, ?, ?, ?)",
+                (symbol, interval, str(period), int(ts.min()), len(ts))
+            )
+
+    def last_timestamp(self, symbol, interval):
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT MAX(ts) FROM bars WHERE symbol=? AND interval=?",
+                (symbol, interval)
+            ).fetchone()
+
+        return row[0]
+
+    def store(self, symbol, interval, df, covered_from=None):
+        """
+        Upsert bars and mark the key as refreshed now.
+        covered_from widens the recorded history start when given.
+        """
+
+        dt = pd.DatetimeIndex(df["datetime"])
+        tz = str(dt.tz) if dt.tz is not None else None
+        ts = dt.as_unit("ns").asi8
+
+        values = df.reindex(columns=BAR_COLUMNS).astype(float)
+        rows = [
+            (symbol, interval, int(t), *(None if pd.isna(v) else v for v in vals))
+            for t, vals in zip(ts, values.itertuples(index=False, name=None))
+        ]
+
+        with self._connect() as con:
+            con.executemany(
+                "INSERT OR REPLACE INTO bars VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+
+            old = con.execute(
+                "SELECT covered_from FROM meta WHERE symbol=? AND interval=?",
+                (symbol, interval)
+            ).fetchone()
+
+            if covered_from is None:
+                covered_from = int(ts.min()) if len(ts) else None
+            if old is not None and old[0] is not None:
+                covered_from = old[0] if covered_from is None else min(old[0], covered_from)
+
+            con.execute(
+                "INSERT OR REPLACE INTO meta VALUES (?, ?, ?, ?, ?)",
+                (symbol, interval, covered_from, time.time(), tz)
+            )
+
+    def touch(self, symbol, interval):
+        """Mark the key as refreshed without new bars."""
+
+        with self._connect() as con:
+            con.execute(
+                "UPDATE meta SET fetched_at=? WHERE symbol=? AND interval=?",
+                (time.time(), symbol, interval)
+            )
+
+    def load(self, symbol, interval, start=None, last=None):
+        """Return cached bars since start (UTC ns), or only the last n, oldest first."""
+
+        meta = self.meta(symbol, interval)
+
+        query = "SELECT ts, open, high, low, close, volume FROM bars WHERE symbol=? AND interval=?"
+        params = [symbol, interval]
+
+        if start is not None:
+            query += " AND ts >= ?"
+            params.append(int(start))
+
+        if last is not None:
+            query = f"SELECT * FROM ({query} ORDER BY ts DESC LIMIT ?)"
+            params.append(int(last))
+
+        with self._connect() as con:
+            df = pd.read_sql_query(query + " ORDER BY ts", con, params=params)
+
+        dt = pd.to_datetime(df.pop("ts"), unit="ns")
+        if meta is not None and meta["tz"]:
+            dt = dt.dt.tz_localize("UTC").dt.tz_convert(meta["tz"])
+
+        df.insert(0, "datetime", dt)
+        return df
+
+    def clear(self, symbol=None):
+        with self._connect() as con:
+            if symbol is None:
+                con.execute("DELETE FROM bars")
+                con.execute("DELETE FROM meta")
+                con.execute("DELETE FROM ranges")
+            else:
+                con.execute("DELETE FROM bars WHERE symbol=?", (symbol,))
+                con.execute("DELETE FROM meta WHERE symbol=?", (symbol,))
+                con.execute("DELETE FROM ranges WHERE symbol=?", (symbol,))
@@ -1,42 +1,169 @@
 import numpy as np
 from sklearn.linear_model import LogisticRegression
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestClassifier, HistGradientBoostingClassifier
+from sklearn.calibration import CalibratedClassifierCV
+from sklearn.model_selection import train_test_split, TimeSeriesSplit
 from sklearn.metrics import accuracy_score
 
-def train_predict(df, model_type="lr"):
-    df = df.dropna()
+from core.features import DEFAULT_FEATURES as FEATURE_COLUMNS
 
-    X = df[["return", "volatility", "sentiment"]]
+# Minimum rows a training window needs before a model is fitted
+MIN_TRAIN_ROWS = 30
+
+# Probability calibration (fitted inside each training window)
+CALIBRATION_METHODS = ("sigmoid", "isotonic")
+CALIBRATION_SPLITS = 3
+# Smaller windows are fitted uncalibrated
+MIN_CALIBRATION_ROWS = 100
+
+
+# ===============================
+# Model backends
+# ===============================
+
+# model_type -> (display name, factory(params, warm_start) -> unfitted estimator)
+MODELS = {}
+
+
+def register_model(model_type, name, factory):
+    """
+    Register a model backend. factory(params, warm_start) returns an
+    unfitted scikit-learn style classifier with predict_proba; params
+    override its default hyperparameters.
+    """
+    MODELS[model_type] = (name, factory)
+
+
+register_model(
+    "lr", "Logistic Regression",
+    lambda params, warm_start: LogisticRegression(**{"warm_start": warm_start, **params})
+)
+
+register_model(
+    "rf", "Random Forest",
+    lambda params, warm_start: RandomForestClassifier(
+        **{"n_estimators": 100, "max_depth": 5, "random_state": 42, **params}
+    )
+)
+
+# Histogram gradient boosting: bins features once, so fit time grows
+# far more slowly with the row count than the random forest's
+register_model(
+    "hgb", "Histogram Gradient Boosting",
+    lambda params, warm_start: HistGradientBoostingClassifier(
+        **{"max_iter": 100, "learning_rate": 0.05, "max_leaf_nodes": 15,
+           "early_stopping": False, "random_state": 42, **params}
+    )
+)
+
+
+def model_name(model_type, calibration=None):
+    """Display name of a model type, as returned by build_model."""
+
+    name = MODELS[model_type][0]
+
+    if calibration is not None:
+        name = f"{name} ({calibration} calibrated)"
+
+    return name
+
+
+def build_model(model_type="lr", warm_start=False, params=None, calibration=None):
+    """
+    Create an unfitted estimator for the given model type.
+    warm_start only applies to Logistic Regression, where the previous
+    solution is reused as the starting point of the next fit.
+    params overrides the default hyperparameters (e.g. from core.tuning).
+    calibration ("sigmoid" or "isotonic") wraps the estimator in a
+    CalibratedClassifierCV over time-ordered splits of the training
+    window, so calibration never sees rows after the window.
+    """
+    if model_type not in MODELS:
+        raise ValueError(f"Unknown model type: {model_type} (available: {', '.join(MODELS)})")
+
+    factory = MODELS[model_type][1]
+    model = factory(params or {}, warm_start)
+
+    if calibration is not None:
+        if calibration not in CALIBRATION_METHODS:
+            raise ValueError(f"Unknown calibration: {calibration}")
+
+        model = CalibratedClassifierCV(
+            model, method=calibration, cv=TimeSeriesSplit(n_splits=CALIBRATION_SPLITS)
+        )
+
+    return model, model_name(model_type, calibration)
+
+
+def fit_arrays(X, y, model_type="lr", model=None, store=None, symbol=None, params=None,
+               calibration=None):
+    """
+    Fit a model on feature / target arrays.
+    Pass a previously fitted warm-start model to refit it in place.
+    With a ModelStore, a model already fitted on the same symbol,
+    hyperparameters and data is loaded instead of retrained.
+    Calibration is skipped for windows under MIN_CALIBRATION_ROWS rows.
+    """
+    if model is None:
+        if len(X) < MIN_CALIBRATION_ROWS:
+            calibration = None
+        model, _ = build_model(model_type, params=params, calibration=calibration)
+
+    # Warm-start fits depend on the previous state, not just the data
+    if store is not None and not getattr(model, "warm_start", False):
+        return store.get_or_fit(symbol, model_type, model, X, y)
+
+    model.fit(X, y)
+    return model
+
+
+def fit(train_df, model_type="lr", features=None, store=None, symbol=None, params=None,
+        calibration=None):
+    """Fit a model on every row of a training frame."""
+    features = features or FEATURE_COLUMNS
+    train_df = train_df.dropna(subset=features + ["target"])
+
+    return fit_arrays(
+        train_df[features].to_numpy(dtype=float),
+        train_df["target"].to_numpy(),
+        model_type,
+        store=store,
+        symbol=symbol,
+        params=params,
+        calibration=calibration
+    )
+
+
+def predict_proba(model, rows, features=None):
+    """Probability of an up move for each held-out row."""
+    features = features or FEATURE_COLUMNS
+    return model.predict_proba(rows[features].to_numpy(dtype=float))[:, 1]
+
+
+def train_predict(df, model_type="lr", features=None):
+    features = features or FEATURE_COLUMNS
+    df = df.dropna(subset=features + ["target"])
+
+    X = df[features]
     y = df["target"]
 
-    if len(df) < 30:
+    if len(df) < MIN_TRAIN_ROWS:
         return None, None, None, None, None, None
 
     X_train, X_test, y_train, y_test = train_test_split(
         X, y, test_size=0.2, shuffle=False
     )
 
-    if model_type == "rf":
-        model = RandomForestClassifier(
-            n_estimators=100,
-            max_depth=5,
-            random_state=42
-        )
-        model_name = "Random Forest"
-        model.fit(X_train, y_train)
-        importances = model.feature_importances_
-    else:
-        model = LogisticRegression()
-        model_name = "Logistic Regression"
-        model.fit(X_train, y_train)
-        importances = None
-
-    # Accuracy
-    accuracy = accuracy_score(y_test, model.predict(X_test))
+    model, model_name = build_model(model_type)
+    model = fit_arrays(X_train.to_numpy(dtype=float), y_train.to_numpy(), model=model)
+
+    importances = getattr(model, "feature_importances_", None)
+
+    # Accuracy on the held-out tail
+    accuracy = accuracy_score(y_test, model.predict(X_test.to_numpy(dtype=float)))
 
     # 🔥 PER-ROW PROBABILITIES (KEY PART)
-    proba = model.predict_proba(X)[:, 1]
+    proba = predict_proba(model, df, features)
 
     # Final prediction (last row)
     prediction = int(proba[-1] > 0.5)
@@ -0,0 +1,189 @@
+"""
+Content-addressed store for fitted models.
+
+A model's key hashes the symbol, model type, estimator hyperparameters and
+the exact training arrays, so a repeat fit of the same window is replaced
+by a load from disk. Models are persisted with joblib, loaded only when
+requested, and the least recently used files are evicted once the store
+exceeds its size cap. Each store keeps a running byte total of the
+artifacts it knows about and only re-scans the directory when that total
+crosses the cap or every RESCAN_EVERY puts, so writes from other
+processes sharing the directory are counted without a full scan per put.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import uuid
+from collections import OrderedDict
+
+import joblib
+import numpy as np
+import sklearn
+
+DEFAULT_STORE_DIR = os.path.join(os.environ.get("MSA_CACHE_DIR", ".cache"), "models")
+
+# Default size cap for the artifacts on disk
+DEFAULT_MAX_BYTES = 512 * 1024 ** 2
+
+# Puts between directory re-scans while the store is under its cap
+RESCAN_EVERY = 256
+
+
+def data_hash(X, y):
+    """Hash of the training arrays (shape, dtype and contents)."""
+
+    h = hashlib.sha256()
+    for arr in (X, y):
+        arr = np.ascontiguousarray(arr)
+        h.update(str((arr.shape, arr.dtype.str)).encode())
+        h.update(arr.tobytes())
+    return h.hexdigest()
+
+
+def model_key(symbol, model_type, params, X, y):
+    meta = json.dumps(
+        # Pickles are only reused by the scikit-learn version that wrote them
+        {"symbol": symbol, "model_type": model_type, "params": params,
+         "sklearn": sklearn.__version__},
+        sort_keys=True,
+        default=str
+    )
+    return hashlib.sha256((meta + data_hash(X, y)).encode()).hexdigest()
+
+
+class ModelStore:
+
+    def __init__(self, root=None, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or DEFAULT_STORE_DIR
+        self.max_bytes = max_bytes
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._index = None
+        self._bytes = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def __getstate__(self):
+        # Pool workers rebuild the index from disk on first use
+        state = self.__dict__.copy()
+        state["_index"] = None
+        state["_lock"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return os.path.join(self.root, key + ".joblib")
+
+    def _scan(self):
+        """key -> file size from disk, least recently used first."""
+
+        entries = []
+        for name in os.listdir(self.root):
+            if name.endswith(".joblib"):
+                try:
+                    st = os.stat(os.path.join(self.root, name))
+                except FileNotFoundError:
+                    # Evicted by another process meanwhile
+                    continue
+                entries.append((st.st_mtime, name[:-len(".joblib")], st.st_size))
+
+        return OrderedDict((key, size) for _, key, size in sorted(entries))
+
+    def _rescan(self):
+        self._index = self._scan()
+        self._bytes = sum(self._index.values())
+        return self._index
+
+    def _load_index(self):
+        if self._index is None:
+            self._rescan()
+
+        return self._index
+
+    def get(self, key):
+        path = self._path(key)
+
+        with self._lock:
+            index = self._load_index()
+
+            try:
+                model = joblib.load(path)
+            except (FileNotFoundError, EOFError):
+                self._bytes -= index.pop(key, 0)
+                self.stats["misses"] += 1
+                return None
+
+            # Mark as recently used (on disk too, for other processes)
+            try:
+                os.utime(path)
+            except FileNotFoundError:
+                pass
+            if key in index:
+                index.move_to_end(key)
+            self.stats["hits"] += 1
+
+        return model
+
+    def put(self, key, model):
+        path = self._path(key)
+        # Unique per call, so concurrent puts of one key never share a temp file
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+
+        joblib.dump(model, tmp)
+        os.replace(tmp, path)
+
+        with self._lock:
+            index = self._load_index()
+            size = os.path.getsize(path)
+            self._bytes += size - index.pop(key, 0)
+            index[key] = size
+            self._puts += 1
+
+            # Other processes may have written to the store meanwhile, so
+            # size it from disk before evicting (and now and then anyway)
+            if self._bytes > self.max_bytes or self._puts % RESCAN_EVERY == 0:
+                index = self._rescan()
+                if key in index:
+                    index.move_to_end(key)
+                self._evict(index)
+
+    def _evict(self, index):
+        while self._bytes > self.max_bytes and len(index) > 1:
+            key, size = index.popitem(last=False)
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+            self._bytes -= size
+            self.stats["evictions"] += 1
+
+    def get_or_fit(self, symbol, model_type, model, X, y):
+        """
+        Return the stored model for this symbol, estimator and training
+        window, fitting and persisting the given unfitted model on a miss.
+        """
+
+        key = model_key(symbol, model_type, model.get_params(), X, y)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached
+
+        model.fit(X, y)
+        self.put(key, model)
+        return model
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._load_index()):
+                try:
+                    os.remove(self._path(key))
+                except FileNotFoundError:
+                    pass
+            self._index = OrderedDict()
+            self._bytes = 0
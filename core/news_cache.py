@@ -0,0 +1,223 @@
+"""
+SQLite-backed news article store.
+
+Articles are keyed by URL (or a content hash when no URL is present) and
+carry a story hash of their normalized headline, so syndicated copies of
+the same story collapse to one entry. Query results are kept for a TTL,
+and each article's sentiment polarity is stored once computed, together
+with a hash of the scored text: an article whose text changes under the
+same URL is rescored.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+DEFAULT_CACHE_DIR = os.environ.get("MSA_CACHE_DIR", ".cache")
+
+# Trailing " - Source" / " | Source" added by aggregators
+_SOURCE_SUFFIX = re.compile(r"\s+[-|–—]\s+[^-|–—]{1,60}$")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def article_text(article):
+    """Text scored for sentiment: headline plus description."""
+    return f"{article['title']} {article.get('description', '')}"
+
+
+def text_hash(article):
+    return hashlib.sha1(article_text(article).encode("utf-8")).hexdigest()
+
+
+def article_key(article):
+    url = article.get("url")
+    if url:
+        return url
+    return "sha1:" + text_hash(article)
+
+
+def story_key(article):
+    """Hash of the normalized headline, shared by syndicated copies."""
+
+    title = (article.get("title") or "").strip()
+    title = _SOURCE_SUFFIX.sub("", title).lower()
+    title = _NON_WORD.sub(" ", title).strip()
+
+    if not title:
+        return article_key(article)
+
+    return hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+
+def dedupe_articles(articles):
+    """Drop syndicated copies, keeping the first article of each story."""
+
+    seen = set()
+    unique = []
+
+    for article in articles:
+        key = story_key(article)
+        if key not in seen:
+            seen.add(key)
+            unique.append(article)
+
+    return unique
+
+
+class NewsCache:
+
+    def __init__(self, path=None):
+        if path is None:
+            os.makedirs(DEFAULT_CACHE_DIR, exist_ok=True)
+            path = os.path.join(DEFAULT_CACHE_DIR, "news.sqlite")
+
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "scored": 0, "score_hits": 0}
+        self._lock = threading.Lock()
+
+        with self._connect() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS articles ("
+                "key TEXT PRIMARY KEY, story TEXT, article TEXT, polarity REAL, text_hash TEXT)"
+            )
+
+            columns = [row[1] for row in con.execute("PRAGMA table_info(articles)")]
+            if "text_hash" not in columns:
+                # Stores from before text hashes: their polarities get rescored
+                con.execute("ALTER TABLE articles ADD COLUMN text_hash TEXT")
+                con.execute("UPDATE articles SET polarity = NULL")
+            con.execute("CREATE INDEX IF NOT EXISTS articles_story ON articles (story)")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS queries ("
+                "query TEXT, page_size INTEGER, fetched_at REAL, keys TEXT, "
+                "PRIMARY KEY (query, page_size))"
+            )
+
+    @contextmanager
+    def _connect(self):
+        con = sqlite3.connect(self.path, timeout=30)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    def count(self, key, n=1):
+        with self._lock:
+            self.stats[key] += n
+
+    def get_query(self, query, page_size, ttl):
+        """Cached articles for a query younger than ttl seconds, else None."""
+
+        with self._connect() as con:
+            row = con.execute(
+                "SELECT fetched_at, keys FROM queries WHERE query=? AND page_size=?",
+                (query, page_size)
+            ).fetchone()
+
+            if row is None or time.time() - row[0] > ttl:
+                return None
+
+            keys = json.loads(row[1])
+            found = dict(con.execute(
+                f"SELECT key, article FROM articles WHERE key IN ({','.join('?' * len(keys))})",
+                keys
+            ).fetchall()) if keys else {}
+
+        if len(found) != len(set(keys)):
+            return None
+
+        return [json.loads(found[k]) for k in keys]
+
+    def put_query(self, query, page_size, articles):
+        """Store deduplicated articles, keeping polarities of unchanged ones."""
+
+        rows = [
+            (article_key(a), story_key(a), json.dumps(a), text_hash(a))
+            for a in articles
+        ]
+
+        with self._connect() as con:
+            con.executemany(
+                "INSERT INTO articles (key, story, article, text_hash) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET story=excluded.story, article=excluded.article, "
+                "polarity=CASE WHEN text_hash = excluded.text_hash THEN polarity END, "
+                "text_hash=excluded.text_hash",
+                rows
+            )
+            con.execute(
+                "INSERT OR REPLACE INTO queries VALUES (?, ?, ?, ?)",
+                (query, page_size, time.time(), json.dumps([r[0] for r in rows]))
+            )
+
+    def polarities(self, articles, score_texts):
+        """
+        Polarity per article. Stored scores are reused (also across
+        syndicated copies of a story) while the article's text is
+        unchanged; only unseen or edited articles are scored, in one
+        score_texts(list of texts) call.
+        """
+
+        if not articles:
+            return []
+
+        keys = [article_key(a) for a in articles]
+        stories = [story_key(a) for a in articles]
+        hashes = [text_hash(a) for a in articles]
+
+        with self._connect() as con:
+            by_key = {}
+            by_story = {}
+            rows = con.execute(
+                "SELECT key, story, polarity, text_hash FROM articles WHERE polarity IS NOT NULL"
+                f" AND (key IN ({','.join('?' * len(keys))})"
+                f" OR story IN ({','.join('?' * len(stories))}))",
+                keys + stories
+            )
+            for key, story, polarity, stored_hash in rows:
+                by_key[key] = (stored_hash, polarity)
+                by_story.setdefault(story, []).append((key, polarity))
+
+            result = [None] * len(articles)
+            unseen = {}
+            for i, (key, story, h) in enumerate(zip(keys, stories, hashes)):
+                if key in by_key and by_key[key][0] == h:
+                    result[i] = by_key[key][1]
+                    continue
+
+                # Another copy of the story, never this article's own old text
+                copies = [p for k, p in by_story.get(story, ()) if k != key]
+                if copies:
+                    result[i] = copies[0]
+                else:
+                    unseen.setdefault(story, []).append(i)
+
+            self.count("score_hits", len(articles) - len(unseen))
+            self.count("scored", len(unseen))
+
+            if unseen:
+                first = [indices[0] for indices in unseen.values()]
+                new_scores = score_texts([article_text(articles[i]) for i in first])
+                new_rows = []
+
+                for indices, polarity in zip(unseen.values(), new_scores):
+                    polarity = float(polarity)
+                    for i in indices:
+                        result[i] = polarity
+                    i = indices[0]
+                    new_rows.append((keys[i], stories[i], json.dumps(articles[i]), polarity, hashes[i]))
+
+                con.executemany(
+                    "INSERT INTO articles (key, story, article, polarity, text_hash) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(key) DO UPDATE SET story=excluded.story, article=excluded.article, "
+                    "polarity=excluded.polarity, text_hash=excluded.text_hash",
+                    new_rows
+                )
+
+        return result
@@ -0,0 +1,157 @@
+"""
+Portfolio backtest across many symbols with one shared capital base.
+
+Inputs are aligned (time x symbols) panels of returns, volatilities,
+predictions and confidences, e.g. walk-forward output pivoted with
+panel_from_frames. Every bar:
+- each symbol's raw exposure follows backtest_strategy's rules:
+  volatility-based base position x confidence weight, long on
+  prediction 1, short on prediction 0
+- raw exposures are scaled down together so gross exposure never
+  exceeds max_leverage of the shared capital
+- the book is rebalanced to these target weights and pays cost on the
+  traded amount (turnover)
+- a portfolio-level drawdown stop closes the whole book
+
+All steps are matrix operations over the full panel.
+"""
+
+import numpy as np
+import pandas as pd
+
+PANEL_FIELDS = ("return", "volatility", "prediction", "confidence")
+
+
+def panel_from_frames(frames):
+    """
+    Align per-symbol frames (symbol -> DataFrame with 'datetime' and the
+    PANEL_FIELDS columns) into one (time x symbols) DataFrame per field.
+    Bars missing for a symbol are NaN.
+    """
+
+    long = pd.concat(
+        [df[["datetime", *PANEL_FIELDS]].assign(symbol=symbol) for symbol, df in frames.items()],
+        ignore_index=True
+    )
+
+    wide = long.pivot_table(index="datetime", columns="symbol", values=list(PANEL_FIELDS), aggfunc="last")
+    return {field: wide[field].reindex(columns=list(frames)) for field in PANEL_FIELDS}
+
+
+def target_weights(
+    returns,
+    volatility,
+    predictions,
+    confidences,
+    conf_threshold=0.52,
+    max_leverage=1.0
+):
+    """
+    Signed portfolio weights (time x symbols) before the drawdown stop.
+    Symbols with any missing input on a bar get no weight on that bar.
+    """
+
+    ret = np.asarray(returns, dtype=float)
+    vol = np.asarray(volatility, dtype=float)
+    pred = np.asarray(predictions, dtype=float)
+    conf = np.asarray(confidences, dtype=float)
+
+    valid = ~(np.isnan(ret) | np.isnan(vol) | np.isnan(pred) | np.isnan(conf))
+
+    # Volatility-based position sizing
+    with np.errstate(divide="ignore", invalid="ignore"):
+        base_position = np.where(valid & (vol != 0), 1 / vol, 0.0)
+    base_position = np.minimum(base_position, 3)
+
+    # Confidence-weighted exposure
+    conf_weight = np.clip((conf - conf_threshold) / (1 - conf_threshold), 0, 1)
+    conf_weight = np.where(valid, conf_weight, 0.0)
+
+    direction = np.where(pred == 1, 1.0, np.where(pred == 0, -1.0, 0.0))
+    raw = direction * base_position * conf_weight
+
+    # Shared capital: scale the whole bar down when gross exposure is too high
+    gross = np.abs(raw).sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        scale = np.where(gross > max_leverage, max_leverage / gross, 1.0)
+
+    return raw * scale
+
+
+def backtest_portfolio(
+    returns,
+    volatility,
+    predictions,
+    confidences,
+    cost=0.001,
+    conf_threshold=0.52,
+    max_drawdown_limit=0.30,
+    max_leverage=1.0
+):
+    """
+    Shared-capital backtest of a (time x symbols) panel.
+
+    Panels are arrays or DataFrames of equal shape; as in
+    backtest_strategy, row t's prediction / confidence trade row t's
+    return. cost is charged on turnover (sum of absolute weight changes)
+    at every rebalance. Once portfolio drawdown exceeds
+    max_drawdown_limit, the breaching bar keeps its return and the book
+    is closed on the next bar (paying the cost of closing it).
+
+    Returns a dict with
+    - "weights": target weights after the stop (time x symbols)
+    - "portfolio": per-bar portfolio_return, gross_exposure, turnover,
+      cum_strategy, cum_market (equal-weight buy and hold), peak, drawdown
+    """
+
+    index = returns.index if isinstance(returns, pd.DataFrame) else None
+    columns = returns.columns if isinstance(returns, pd.DataFrame) else None
+
+    ret = np.asarray(returns, dtype=float)
+    weights = target_weights(
+        ret, volatility, predictions, confidences,
+        conf_threshold=conf_threshold,
+        max_leverage=max_leverage
+    )
+
+    ret0 = np.nan_to_num(ret)
+    gross_return = (weights * ret0).sum(axis=1)
+
+    def run(weights, gross_return):
+        previous = np.vstack([np.zeros((1, weights.shape[1])), weights[:-1]])
+        turnover = np.abs(weights - previous).sum(axis=1)
+        portfolio_return = gross_return - cost * turnover
+        cum = np.cumprod(1 + portfolio_return)
+        peak = np.maximum.accumulate(cum)
+        return turnover, portfolio_return, cum, peak
+
+    turnover, portfolio_return, cum, peak = run(weights, gross_return)
+
+    # Drawdown-based stop trading rule
+    breach = np.flatnonzero((peak - cum) / peak > max_drawdown_limit)
+
+    if len(breach) > 0:
+        # Trade through the breaching bar, flat afterwards
+        weights[breach[0] + 1:] = 0.0
+        gross_return[breach[0] + 1:] = 0.0
+        turnover, portfolio_return, cum, peak = run(weights, gross_return)
+
+    # Equal-weight buy and hold over the symbols available on each bar
+    with np.errstate(invalid="ignore"):
+        market_return = np.nanmean(ret, axis=1) if ret.size else np.zeros(len(ret))
+    cum_market = np.cumprod(1 + np.nan_to_num(market_return))
+
+    portfolio = pd.DataFrame({
+        "portfolio_return": portfolio_return,
+        "gross_exposure": np.abs(weights).sum(axis=1),
+        "turnover": turnover,
+        "cum_strategy": cum,
+        "cum_market": cum_market,
+        "peak": peak,
+        "drawdown": (peak - cum) / peak,
+    }, index=index)
+
+    return {
+        "weights": pd.DataFrame(weights, index=index, columns=columns),
+        "portfolio": portfolio,
+    }
@@ -0,0 +1,291 @@
+"""
+Per-stage profiling for the analysis pipeline.
+
+Stages are timed with the stage() context manager or the profiled()
+decorator and aggregated by name: call count, total / mean / max wall
+time and, when memory tracking is on, the peak memory allocated inside
+the stage (tracemalloc).
+
+Profiling is off by default and costs one flag check per call while off.
+Switch it on with enable() or the environment:
+- MSA_PROFILE=1         wall time and call counts
+- MSA_PROFILE_MEMORY=1  also peak memory (slower: traces every allocation)
+
+Stats live in the current process. Stages run inside pool workers are
+collected by returning snapshot() from the worker and merge()-ing it in
+the parent (see core.batch --profile).
+
+start_collecting() records the calling thread's stages into a private
+stats dict instead, independent of enable() / disable() and of other
+threads, e.g. one per Streamlit session.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+REPORT_COLUMNS = ["stage", "calls", "total_s", "mean_s", "max_s", "peak_mem_kb"]
+
+_TRUE = ("1", "true", "yes", "on")
+
+_state = {
+    "enabled": os.environ.get("MSA_PROFILE", "").lower() in _TRUE,
+    "memory": os.environ.get("MSA_PROFILE_MEMORY", "").lower() in _TRUE,
+    # Only stop tracemalloc if this module started it
+    "owns_tracemalloc": False,
+}
+_state["enabled"] = _state["enabled"] or _state["memory"]
+
+if _state["memory"] and not tracemalloc.is_tracing():
+    tracemalloc.start()
+    _state["owns_tracemalloc"] = True
+
+_stats = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+# Keys of the collectors (see start_collecting) that track memory
+_memory_keys = set()
+
+
+def _update_tracing():
+    """Run tracemalloc while the module or any collector tracks memory."""
+
+    with _lock:
+        wanted = _state["memory"] or bool(_memory_keys)
+
+        if wanted and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _state["owns_tracemalloc"] = True
+
+        elif not wanted:
+            if _state["owns_tracemalloc"] and tracemalloc.is_tracing():
+                tracemalloc.stop()
+            _state["owns_tracemalloc"] = False
+
+
+def enable(memory=False):
+    """Start recording stages (and peak memory if memory=True)."""
+
+    _state["enabled"] = True
+    _state["memory"] = memory
+    _update_tracing()
+
+
+def disable():
+    _state["enabled"] = False
+    _state["memory"] = False
+    _update_tracing()
+
+
+def is_enabled():
+    return _state["enabled"]
+
+
+def memory_enabled():
+    return _state["memory"]
+
+
+def start_collecting(key, memory=False):
+    """
+    Record the calling thread's stages into a fresh stats dict (returned,
+    for report(stats)) instead of the process-wide stats. key names the
+    caller, e.g. a Streamlit session: tracemalloc runs while any key
+    tracks memory, so one caller never switches it off for another.
+    """
+
+    stats = {}
+    _local.collector = stats
+    _local.memory = memory
+
+    with _lock:
+        if memory:
+            _memory_keys.add(key)
+        else:
+            _memory_keys.discard(key)
+    _update_tracing()
+
+    return stats
+
+
+def stop_collecting(key):
+    """Stop the calling thread's collector and release key's memory tracking."""
+
+    _local.collector = None
+    _local.memory = False
+
+    with _lock:
+        _memory_keys.discard(key)
+    _update_tracing()
+
+
+def _collector():
+    return getattr(_local, "collector", None)
+
+
+def reset():
+    with _lock:
+        _stats.clear()
+
+
+def snapshot():
+    """Picklable copy of the raw per-stage stats, for merge() in another process."""
+
+    with _lock:
+        return {name: dict(s) for name, s in _stats.items()}
+
+
+def merge(stats):
+    """Fold a snapshot() taken in another process into this one's stats."""
+
+    with _lock:
+        for name, other in stats.items():
+            entry = _stats.setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0, "peak_mem": None})
+            entry["calls"] += other["calls"]
+            entry["total_s"] += other["total_s"]
+            entry["max_s"] = max(entry["max_s"], other["max_s"])
+
+            if other["peak_mem"] is not None:
+                entry["peak_mem"] = max(entry["peak_mem"] or 0, other["peak_mem"])
+
+
+def _record(name, elapsed, peak, stats=None):
+    with _lock:
+        entry = (_stats if stats is None else stats).setdefault(name, {"calls": 0, "total_s": 0.0, "max_s": 0.0, "peak_mem": None})
+        entry["calls"] += 1
+        entry["total_s"] += elapsed
+        entry["max_s"] = max(entry["max_s"], elapsed)
+
+        if peak is not None:
+            entry["peak_mem"] = max(entry["peak_mem"] or 0, peak)
+
+
+@contextmanager
+def stage(name):
+    """Time the enclosed block under name."""
+
+    collector = _collector()
+
+    if collector is None and not _state["enabled"]:
+        yield
+        return
+
+    memory = _local.memory if collector is not None else _state["memory"]
+    memory = memory and tracemalloc.is_tracing()
+    frames = _local.__dict__.setdefault("frames", [])
+
+    if memory:
+        # Hand the peak so far to the open outer stages before resetting it
+        current, peak = tracemalloc.get_traced_memory()
+        for frame in frames:
+            frame["peak"] = max(frame["peak"], peak)
+        tracemalloc.reset_peak()
+
+        frame = {"start": current, "peak": current}
+        frames.append(frame)
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        peak = None
+
+        if memory:
+            frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+            frames.pop()
+            if frames:
+                frames[-1]["peak"] = max(frames[-1]["peak"], frame["peak"])
+            peak = frame["peak"] - frame["start"]
+
+        _record(name, elapsed, peak, collector)
+
+
+def profiled(name=None):
+    """Decorator form of stage(); the stage defaults to module.function."""
+
+    def decorate(func):
+        label = name or f"{func.__module__}.{func.__qualname__}"
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state["enabled"] and _collector() is None:
+                return func(*args, **kwargs)
+            with stage(label):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+def report(stats=None):
+    """
+    Aggregated stats, one row per stage, slowest total first; stats is
+    a start_collecting() dict (default: the process-wide stats).
+    """
+
+    stats = _stats if stats is None else stats
+
+    with _lock:
+        rows = [
+            {
+                "stage": name,
+                "calls": s["calls"],
+                "total_s": s["total_s"],
+                "mean_s": s["total_s"] / s["calls"],
+                "max_s": s["max_s"],
+                "peak_mem_kb": None if s["peak_mem"] is None else s["peak_mem"] / 1024,
+            }
+            for name, s in stats.items()
+        ]
+
+    df = pd.DataFrame(rows, columns=REPORT_COLUMNS)
+    return df.sort_values("total_s", ascending=False, ignore_index=True)
+
+
+def export(path):
+    """Write report() to path as JSON (.json) or CSV (anything else)."""
+
+    df = report()
+
+    if path.endswith(".json"):
+        with open(path, "w") as f:
+            json.dump(df.to_dict("records"), f, indent=2)
+    else:
+        df.to_csv(path, index=False)
+
+    return path
+
+
+def streamlit_panel(st, title="⏱️ Pipeline Profile", stats=None):
+    """Render report(stats) in a Streamlit expander with downloads."""
+
+    df = report(stats)
+
+    with st.expander(title, expanded=False):
+        if df.empty:
+            st.caption("No stages recorded")
+            return
+
+        st.dataframe(df, use_container_width=True)
+
+        c1, c2 = st.columns(2)
+        c1.download_button(
+            "Download JSON",
+            json.dumps(df.to_dict("records"), indent=2),
+            file_name="profile.json",
+            mime="application/json"
+        )
+        c2.download_button(
+            "Download CSV",
+            df.to_csv(index=False),
+            file_name="profile.csv",
+            mime="text/csv"
+        )
@@ -1,25 +1,111 @@
-import matplotlib.pyplot as plt
+"""
+Report charts rendered in memory.
+
+Charts are drawn on standalone matplotlib Figure objects with the
+non-interactive Agg canvas (no pyplot global state, so concurrent
+sessions and pool workers never share a figure) and returned as PNG
+BytesIO buffers that ReportLab reads directly.
+"""
+
+from io import BytesIO
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from core.downsample import DEFAULT_POINTS, lttb
+from core.profiling import profiled
+
+
+def _new_figure(figsize):
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    return fig, fig.add_subplot()
+
+
+def _to_buffer(fig, dpi=100):
+    fig.tight_layout()
+
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi)
+    buf.seek(0)
+    return buf
+
+
+def _save(buf, filename):
+    with open(filename, "wb") as f:
+        f.write(buf.getvalue())
+
+
+@profiled("report.equity_curve")
+def equity_curve_png(bt_df, max_points=DEFAULT_POINTS):
+    """Strategy vs buy-and-hold equity, each line reduced with LTTB to max_points."""
+
+    fig, ax = _new_figure((6, 4))
+    bars = np.arange(len(bt_df))
+
+    for column, label in (("cum_strategy", "AI Strategy"), ("cum_market", "Buy & Hold")):
+        ax.plot(*lttb(bars, bt_df[column].to_numpy(), max_points), label=label)
+
+    ax.legend()
+    ax.set_title("Strategy vs Buy & Hold")
+    ax.set_xlabel("Time")
+    ax.set_ylabel("Cumulative Return")
+    return _to_buffer(fig)
+
+
+def pie_chart_png(labels, values, title):
+    fig, ax = _new_figure((4, 4))
+
+    if sum(values) > 0:
+        ax.pie(
+            values,
+            labels=labels,
+            autopct="%1.1f%%",
+            startangle=90
+        )
+    else:
+        ax.text(0.5, 0.5, "No data", ha="center", va="center")
+        ax.axis("off")
+
+    ax.set_title(title)
+    return _to_buffer(fig)
+
+
+def prediction_distribution_png(predictions):
+    """Bullish / bearish split of the walk-forward predictions."""
+
+    pred = np.asarray(predictions, dtype=float)
+    counts = {"Bullish": int((pred == 1).sum()), "Bearish": int((pred == 0).sum())}
+    counts = {k: v for k, v in counts.items() if v}
+
+    return pie_chart_png(list(counts), list(counts.values()), "Prediction Distribution")
+
+
+def trade_outcomes_png(strategy_returns):
+    """Winning / losing / flat split of the strategy's bars."""
+
+    ret = np.asarray(strategy_returns, dtype=float)
+    ret = ret[~np.isnan(ret)]
+    counts = {"Winning": int((ret > 0).sum()), "Losing": int((ret < 0).sum()), "Flat": int((ret == 0).sum())}
+    counts = {k: v for k, v in counts.items() if v}
+
+    return pie_chart_png(list(counts), list(counts.values()), "Trade Outcomes")
+
+
+def report_charts(bt_df, max_points=DEFAULT_POINTS):
+    """All report charts for a backtest frame, keyed by report slot."""
+
+    return {
+        "equity_curve": equity_curve_png(bt_df, max_points),
+        "prediction_distribution": prediction_distribution_png(bt_df["prediction"]),
+        "trade_outcomes": trade_outcomes_png(bt_df["strategy_return"]),
+    }
+
 
 def save_equity_curve(bt_df, filename="equity_curve.png"):
-    plt.figure(figsize=(6, 4))
-    plt.plot(bt_df['cum_strategy'], label="AI Strategy")
-    plt.plot(bt_df['cum_market'], label="Buy & Hold")
-    plt.legend()
-    plt.title("Strategy vs Buy & Hold")
-    plt.xlabel("Time")
-    plt.ylabel("Cumulative Return")
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
+    _save(equity_curve_png(bt_df), filename)
+
+
 def save_pie_chart(labels, values, title, filename):
-    plt.figure(figsize=(4, 4))
-    plt.pie(
-        values,
-        labels=labels,
-        autopct="%1.1f%%",
-        startangle=90
-    )
-    plt.title(title)
-    plt.tight_layout()
-    plt.savefig(filename)
-    plt.close()
+    _save(pie_chart_png(labels, values, title), filename)
@@ -5,29 +5,127 @@ from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from datetime import datetime
+from functools import lru_cache
 import os
 
+from core.profiling import profiled
 
-def safe_image(path, width, height, styles):
 
-    if path and os.path.exists(path):
+@lru_cache(maxsize=1)
+def get_styles():
+    """Sample stylesheet, built once per process."""
+    return getSampleStyleSheet()
+
+
+def safe_image(source, width, height, styles):
+    """
+    Image flowable from a file path or an in-memory buffer (BytesIO),
+    or a placeholder paragraph when it is missing or unreadable.
+    """
+
+    if hasattr(source, "read"):
 
         try:
-            return Image(path, width=width, height=height)
+            source.seek(0)
+            return Image(source, width=width, height=height)
+
+        except Exception:
+
+            return Paragraph("Error loading image", styles["Normal"])
+
+    if source and os.path.exists(source):
+
+        try:
+            return Image(source, width=width, height=height)
 
         except Exception:
 
             return Paragraph(
-                f"Error loading image : {path}",
+                f"Error loading image : {source}",
                 styles["Normal"]
             )
 
     return Paragraph(
-        f"Image not available : {path}",
+        f"Image not available : {source}" if source else "Image not available",
         styles["Normal"]
     )
 
 
+def _section(heading, text, styles):
+    return [
+        Paragraph(heading, styles["Heading2"]),
+        Paragraph(text, styles["Normal"]),
+        Spacer(1,12),
+    ]
+
+
+# Fixed report text. Only the text and the stylesheet are shared between
+# documents: ReportLab mutates flowables while laying them out, so each
+# build gets freshly created ones (batch reports are built concurrently).
+
+_BODY_SECTIONS = (
+    (
+        "1. Executive Summary",
+        "This report presents a quantitative trading framework combining market price "
+        "data with NLP-based news sentiment. Machine learning is used to predict next-day "
+        "price direction and generate trading signals evaluated using risk-adjusted metrics."
+    ),
+    (
+        "2. Data & Methodology",
+        "Historical OHLC price data was sourced from Yahoo Finance. Financial news was "
+        "processed using sentiment polarity scoring. Features were engineered from both "
+        "price action and sentiment and fed into a supervised learning model."
+    ),
+    (
+        "3. Feature Engineering",
+        "Features include daily returns (momentum), rolling volatility (risk proxy), "
+        "and aggregated sentiment scores. The target variable represents next-day price "
+        "direction."
+    ),
+    (
+        "4. Model Architecture",
+        "A Random Forest classifier was employed due to its ability to model non-linear "
+        "relationships and robustness against noisy financial data."
+    ),
+    (
+        "5. Trading Strategy",
+        "Predictions are converted into BUY, SELL, or HOLD signals using confidence "
+        "thresholds. The strategy avoids overtrading and focuses on high-confidence signals."
+    ),
+    (
+        "6. Backtesting Results",
+        "The strategy was backtested against a Buy-and-Hold benchmark with no lookahead "
+        "bias. The following equity curve compares cumulative performance."
+    ),
+)
+
+_DISTRIBUTION_TEXT = (
+    "The following charts summarize the model’s behavior in terms of prediction "
+    "bias and realized trade outcomes."
+)
+
+_RISK_TEXT = (
+    "Sharpe Ratio equation:<br/>"
+    "Sharpe = Mean(Return) / Std(Return)<br/><br/>"
+    "Maximum Drawdown equation:<br/>"
+    "Drawdown = (Peak - Trough) / Peak"
+)
+
+_LIMITATIONS_TEXT = (
+    "Transaction costs are modeled at a fixed rate; however, slippage and regime "
+    "detection are not yet incorporated. News sentiment may also suffer from "
+    "reporting delays and headline bias."
+)
+
+_CONCLUSION_TEXT = (
+    "This research demonstrates the feasibility of integrating sentiment analysis "
+    "with machine learning for quantitative trading. By combining walk-forward "
+    "validation, confidence-weighted position sizing, and drawdown-based risk "
+    "controls, the strategy achieves robust risk-adjusted performance."
+)
+
+
+@profiled("report.pdf")
 def generate_research_report(
     filename,
     symbol,
@@ -36,10 +134,19 @@ def generate_research_report(
     signal,
     sharpe,
     drawdown,
-    equity_curve_path
+    equity_curve_path=None,
+    prediction_distribution=None,
+    trade_outcomes=None
 ):
+    """
+    Build the research PDF.
+
+    filename is a path or a writable binary buffer. Charts
+    (equity_curve_path, prediction_distribution, trade_outcomes) are file
+    paths or in-memory PNG buffers from core.report_assets.
+    """
 
-    styles = getSampleStyleSheet()
+    styles = get_styles()
     story = []
 
     doc = SimpleDocTemplate(
@@ -74,104 +181,10 @@ def generate_research_report(
 
     story.append(PageBreak())
 
-    # ---------- EXECUTIVE SUMMARY ----------
-
-    story.append(
-        Paragraph("1. Executive Summary",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "This report presents a quantitative trading framework combining market price "
-            "data with NLP-based news sentiment. Machine learning is used to predict next-day "
-            "price direction and generate trading signals evaluated using risk-adjusted metrics.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
+    # ---------- SUMMARY ... BACKTESTING ----------
 
-    # ---------- METHODOLOGY ----------
-
-    story.append(
-        Paragraph("2. Data & Methodology",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "Historical OHLC price data was sourced from Yahoo Finance. Financial news was "
-            "processed using sentiment polarity scoring. Features were engineered from both "
-            "price action and sentiment and fed into a supervised learning model.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
-
-    # ---------- FEATURES ----------
-
-    story.append(
-        Paragraph("3. Feature Engineering",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "Features include daily returns (momentum), rolling volatility (risk proxy), "
-            "and aggregated sentiment scores. The target variable represents next-day price "
-            "direction.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
-
-    # ---------- MODEL ----------
-
-    story.append(
-        Paragraph("4. Model Architecture",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "A Random Forest classifier was employed due to its ability to model non-linear "
-            "relationships and robustness against noisy financial data.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
-
-    # ---------- STRATEGY ----------
-
-    story.append(
-        Paragraph("5. Trading Strategy",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "Predictions are converted into BUY, SELL, or HOLD signals using confidence "
-            "thresholds. The strategy avoids overtrading and focuses on high-confidence signals.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
-
-    # ---------- BACKTESTING ----------
-
-    story.append(
-        Paragraph("6. Backtesting Results",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "The strategy was backtested against a Buy-and-Hold benchmark with no lookahead "
-            "bias. The following equity curve compares cumulative performance.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
+    for heading, text in _BODY_SECTIONS:
+        story.extend(_section(heading, text, styles))
 
     story.append(
         safe_image(equity_curve_path,400,300,styles)
@@ -190,11 +203,7 @@ def generate_research_report(
     story.append(Spacer(1,12))
 
     story.append(
-        Paragraph(
-            "The following charts summarize the model’s behavior in terms of prediction "
-            "bias and realized trade outcomes.",
-            styles["Normal"]
-        )
+        Paragraph(_DISTRIBUTION_TEXT,styles["Normal"])
     )
 
     story.append(Spacer(1,12))
@@ -204,7 +213,7 @@ def generate_research_report(
     )
 
     story.append(
-        safe_image("prediction_distribution.png",300,300,styles)
+        safe_image(prediction_distribution,300,300,styles)
     )
 
     story.append(Spacer(1,20))
@@ -214,7 +223,7 @@ def generate_research_report(
     )
 
     story.append(
-        safe_image("trade_outcomes.png",300,300,styles)
+        safe_image(trade_outcomes,300,300,styles)
     )
 
     story.append(Spacer(1,20))
@@ -226,13 +235,7 @@ def generate_research_report(
     )
 
     story.append(
-        Paragraph(
-            "Sharpe Ratio equation:<br/>"
-            "Sharpe = Mean(Return) / Std(Return)<br/><br/>"
-            "Maximum Drawdown equation:<br/>"
-            "Drawdown = (Peak - Trough) / Peak",
-            styles["Normal"]
-        )
+        Paragraph(_RISK_TEXT,styles["Normal"])
     )
 
     story.append(Spacer(1,8))
@@ -289,37 +292,16 @@ def generate_research_report(
 
     story.append(Spacer(1,12))
 
-    # ---------- LIMITATIONS ----------
-
-    story.append(
-        Paragraph("10. Limitations",styles["Heading2"])
-    )
-
-    story.append(
-        Paragraph(
-            "Transaction costs are modeled at a fixed rate; however, slippage and regime "
-            "detection are not yet incorporated. News sentiment may also suffer from "
-            "reporting delays and headline bias.",
-            styles["Normal"]
-        )
-    )
-
-    story.append(Spacer(1,12))
+    # ---------- LIMITATIONS / CONCLUSION ----------
 
-    # ---------- CONCLUSION ----------
+    story.extend(_section("10. Limitations", _LIMITATIONS_TEXT, styles))
 
     story.append(
         Paragraph("11. Conclusion & Future Work",styles["Heading2"])
     )
 
     story.append(
-        Paragraph(
-            "This research demonstrates the feasibility of integrating sentiment analysis "
-            "with machine learning for quantitative trading. By combining walk-forward "
-            "validation, confidence-weighted position sizing, and drawdown-based risk "
-            "controls, the strategy achieves robust risk-adjusted performance.",
-            styles["Normal"]
-        )
+        Paragraph(_CONCLUSION_TEXT,styles["Normal"])
     )
 
     # ---------- SAFE BUILD ----------
@@ -331,3 +313,5 @@ def generate_research_report(
     except Exception as e:
 
         print("PDF generation failed :",str(e))
+
+    return filename
@@ -1,11 +1,271 @@
 import numpy as np
+import pandas as pd
 
 def sharpe_ratio(returns):
-    if returns.std() == 0:
+    std = returns.std()
+    if std == 0:
         return 0
-    return (returns.mean() / returns.std()) * np.sqrt(252)
+    return (returns.mean() / std) * np.sqrt(252)
 
 def max_drawdown(cumulative_returns):
     peak = cumulative_returns.cummax()
     drawdown = (cumulative_returns - peak) / peak
     return drawdown.min()
+
+
+# ===============================
+# Fused multi-strategy metrics
+# ===============================
+
+def _as_2d(values):
+    """(time x strategies) float array plus the column labels, if any."""
+    if isinstance(values, pd.DataFrame):
+        return values.to_numpy(dtype=float), values.columns
+    arr = np.asarray(values, dtype=float)
+    return (arr[:, None], None) if arr.ndim == 1 else (arr, None)
+
+
+def _wrap(metrics, values, index=None):
+    """Return a Series for 1-D input, a DataFrame (one row per strategy) for 2-D."""
+    if isinstance(values, pd.DataFrame) or np.ndim(values) == 2:
+        return pd.DataFrame(metrics, index=index)
+    return pd.Series({k: v[0] for k, v in metrics.items()})
+
+
+def compute_all_metrics(
+    returns,
+    equity=None,
+    positions=None,
+    periods=252,
+    var_level=0.95
+):
+    """
+    Risk metrics for one or many return series in one fused pass.
+
+    returns (and optional equity / positions) are 1-D or 2-D
+    (time x strategies) arrays, Series or DataFrames; NaN marks missing
+    bars. Moments come from shared sums over the whole array, so thousands
+    of columns are scored without a Python loop.
+
+    Metrics: sharpe, sortino, calmar, annual_return, max_drawdown,
+    max_drawdown_duration (bars), var / cvar (historical, at var_level,
+    as returns), hit_rate (share of non-zero bars that were positive),
+    turnover (mean absolute position change; NaN without positions),
+    final_equity.
+    """
+
+    r, columns = _as_2d(returns)
+    valid = ~np.isnan(r)
+    r0 = np.where(valid, r, 0.0)
+    n = valid.sum(axis=0)
+    n_safe = np.maximum(n, 1)
+
+    # Shared moments
+    total = r0.sum(axis=0)
+    mean = total / n_safe
+    sq = (r0 * r0).sum(axis=0)
+    downside_sq = (np.minimum(r0, 0.0) ** 2).sum(axis=0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var = np.maximum(sq - n * mean * mean, 0.0) / np.maximum(n - 1, 1)
+        std = np.sqrt(var)
+        downside = np.sqrt(downside_sq / n_safe)
+
+        sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(periods))
+        sortino = np.where(downside == 0, 0.0, mean / downside * np.sqrt(periods))
+
+    # Equity path, drawdown and time under water
+    if equity is None:
+        eq = np.cumprod(1 + r0, axis=0)
+    else:
+        eq, _ = _as_2d(equity)
+        eq = pd.DataFrame(eq).ffill().bfill().to_numpy()
+
+    peak = np.maximum.accumulate(eq, axis=0)
+    drawdown = eq / peak - 1
+    max_dd = drawdown.min(axis=0)
+
+    bars = np.arange(len(eq))[:, None]
+    last_peak = np.maximum.accumulate(np.where(drawdown >= 0, bars, 0), axis=0)
+    dd_duration = (bars - last_peak).max(axis=0) if len(eq) else np.zeros(r.shape[1])
+
+    final_equity = eq[-1] if len(eq) else np.ones(r.shape[1])
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        annual_return = np.power(final_equity, periods / n_safe) - 1
+        calmar = np.where(max_dd == 0, 0.0, annual_return / np.abs(max_dd))
+
+    # Tail risk (historical)
+    var_q = np.nanquantile(r, 1 - var_level, axis=0) if len(r) else np.full(r.shape[1], np.nan)
+    tail = valid & (r <= var_q)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cvar = np.where(tail, r0, 0.0).sum(axis=0) / tail.sum(axis=0)
+
+        traded = valid & (r != 0)
+        hit_rate = ((r0 > 0) & traded).sum(axis=0) / traded.sum(axis=0)
+
+    if positions is not None:
+        pos, _ = _as_2d(positions)
+        turnover = np.nanmean(np.abs(np.diff(pos, axis=0)), axis=0)
+    else:
+        turnover = np.full(r.shape[1], np.nan)
+
+    metrics = {
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "calmar": calmar,
+        "annual_return": annual_return,
+        "max_drawdown": max_dd,
+        "max_drawdown_duration": dd_duration,
+        "var": var_q,
+        "cvar": cvar,
+        "hit_rate": hit_rate,
+        "turnover": turnover,
+        "final_equity": final_equity,
+    }
+
+    return _wrap(metrics, returns, columns)
+
+
+def _rolling_path_metrics(eq, r, var, window):
+    """
+    Max drawdown, longest drawdown (bars under water) and CVaR within
+    each trailing window. One vectorized pass per bar offset in the
+    window, over every window start at once.
+    """
+
+    T = len(eq)
+    mdd = np.full(eq.shape, np.nan)
+    duration = np.full(eq.shape, np.nan)
+    cvar = np.full(eq.shape, np.nan)
+
+    if T < window:
+        return mdd, duration, cvar
+
+    starts = T - window + 1
+    ends = slice(window - 1, None)
+    var_end = var[ends]
+
+    peak = eq[:starts].copy()
+    worst = np.zeros((starts, eq.shape[1]))
+    run = np.zeros((starts, eq.shape[1]))
+    longest = np.zeros((starts, eq.shape[1]))
+    tail_sum = np.zeros((starts, eq.shape[1]))
+    tail_n = np.zeros((starts, eq.shape[1]))
+
+    for j in range(window):
+        e = eq[j:j + starts]
+        peak = np.maximum(peak, e)
+        worst = np.minimum(worst, e / peak - 1)
+
+        run = np.where(e < peak, run + 1, 0)
+        longest = np.maximum(longest, run)
+
+        x = r[j:j + starts]
+        tail = x <= var_end
+        tail_sum += np.where(tail, x, 0.0)
+        tail_n += tail
+
+    mdd[ends] = worst
+    duration[ends] = longest
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cvar[ends] = tail_sum / tail_n
+
+    return mdd, duration, cvar
+
+
+def rolling_metrics(returns, window=63, positions=None, periods=252, var_level=0.95):
+    """
+    Rolling versions of the metrics in compute_all_metrics over the
+    trailing window bars (window >= 2); the first window - 1 bars are NaN.
+
+    Means and deviations come from cumulative sums (one pass per array);
+    the path-dependent metrics (max drawdown, its duration, CVaR) take one
+    vectorized pass per bar offset in the window. Returns a dict of
+    (time x strategies) frames, or Series for 1-D input: sharpe, sortino,
+    volatility, annual_return, calmar, hit_rate, drawdown (from the
+    highest equity within the window), max_drawdown,
+    max_drawdown_duration, var, cvar and turnover (NaN without positions).
+    """
+
+    if window < 2:
+        raise ValueError("window must be >= 2")
+
+    r, columns = _as_2d(returns)
+    valid = ~np.isnan(r)
+    r0 = np.where(valid, r, 0.0)
+
+    def window_sum(x, size=window):
+        c = np.cumsum(x, axis=0)
+        out = c.copy()
+        out[size:] -= c[:-size]
+        out[:window - 1] = np.nan
+        return out
+
+    n = window_sum(valid.astype(float))
+    s1 = window_sum(r0)
+    s2 = window_sum(r0 * r0)
+    sd = window_sum(np.minimum(r0, 0.0) ** 2)
+    log_growth = window_sum(np.log1p(r0))
+    hits = window_sum((r0 > 0).astype(float))
+    traded = window_sum((valid & (r0 != 0)).astype(float))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = s1 / n
+        std = np.sqrt(np.maximum(s2 - n * mean * mean, 0.0) / (n - 1))
+        downside = np.sqrt(sd / n)
+
+        sharpe = np.where(std == 0, 0.0, mean / std * np.sqrt(periods))
+        sortino = np.where(downside == 0, 0.0, mean / downside * np.sqrt(periods))
+        hit_rate = hits / traded
+        annual_return = np.exp(log_growth * periods / n) - 1
+
+    sharpe[np.isnan(mean)] = np.nan
+    sortino[np.isnan(mean)] = np.nan
+
+    eq = np.cumprod(1 + r0, axis=0)
+    frame = pd.DataFrame(eq)
+    drawdown = eq / frame.rolling(window).max().to_numpy() - 1
+
+    var = pd.DataFrame(r).rolling(window).quantile(1 - var_level).to_numpy()
+    max_dd, dd_duration, cvar = _rolling_path_metrics(eq, r0, var, window)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        calmar = np.where(max_dd == 0, 0.0, annual_return / np.abs(max_dd))
+    calmar[np.isnan(max_dd)] = np.nan
+
+    if positions is not None:
+        # The window - 1 position changes inside each window
+        pos, _ = _as_2d(positions)
+        change = np.abs(np.diff(pos, axis=0, prepend=pos[:1]))
+        change[0] = np.nan
+        moved = ~np.isnan(change)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            turnover = (
+                window_sum(np.where(moved, change, 0.0), window - 1)
+                / window_sum(moved.astype(float), window - 1)
+            )
+    else:
+        turnover = np.full(r.shape, np.nan)
+
+    out = {
+        "sharpe": sharpe,
+        "sortino": sortino,
+        "volatility": std * np.sqrt(periods),
+        "annual_return": annual_return,
+        "calmar": calmar,
+        "hit_rate": hit_rate,
+        "drawdown": drawdown,
+        "max_drawdown": max_dd,
+        "max_drawdown_duration": dd_duration,
+        "var": var,
+        "cvar": cvar,
+        "turnover": turnover,
+    }
+
+    index = returns.index if isinstance(returns, (pd.Series, pd.DataFrame)) else None
+    return {
+        k: pd.DataFrame(v, index=index, columns=columns) if np.ndim(returns) == 2
+        else pd.Series(v[:, 0], index=index, name=k)
+        for k, v in out.items()
+    }
@@ -1,4 +1,25 @@
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from textblob import TextBlob
+from textblob.en import sentiment as _pattern_lexicon
+
+from core.profiling import profiled
+
+# Batches with at least this many unseen texts are fanned out to a pool
+POOL_THRESHOLD = 2000
+
+# Maximum number of memoized scores
+CACHE_SIZE = 100_000
+
+_WORD = re.compile(r"[a-z']+")
+_NEGATIONS = {"not", "never", "no", "n't"}
+
 
 def analyze_sentiment(text):
     if not text:
@@ -12,3 +33,134 @@ def get_sentiment_label(score):
         return "🔴 Bearish"
     else:
         return "🟡 Neutral"
+
+
+# ===============================
+# Lexicon scorer
+# ===============================
+
+# Word -> polarity table compiled once from TextBlob's pattern lexicon
+LEXICON = {
+    word: tags[None][0]
+    for word, tags in _pattern_lexicon.items()
+    if None in tags
+}
+
+
+def lexicon_sentiment(text):
+    """
+    Fast approximation of TextBlob polarity: mean lexicon polarity of the
+    words in text, with a preceding negation flipping and halving a word.
+    """
+    if not text:
+        return 0
+
+    scores = []
+    negate = False
+
+    for word in _WORD.findall(text.lower()):
+        if word in _NEGATIONS:
+            negate = True
+            continue
+
+        polarity = LEXICON.get(word)
+        if polarity is not None:
+            scores.append(-0.5 * polarity if negate else polarity)
+        negate = False
+
+    return sum(scores) / len(scores) if scores else 0.0
+
+
+SCORERS = {
+    "textblob": analyze_sentiment,
+    "lexicon": lexicon_sentiment,
+}
+
+
+def register_scorer(name, scorer):
+    """Register a text -> polarity function as a score_batch backend."""
+    SCORERS[name] = scorer
+
+
+# ===============================
+# Batched, memoized scoring
+# ===============================
+
+_cache = OrderedDict()
+_cache_lock = threading.Lock()
+
+
+def _text_key(backend, text):
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+    return backend, digest
+
+
+def _cache_get(key):
+    with _cache_lock:
+        value = _cache.get(key)
+        if value is not None:
+            _cache.move_to_end(key)
+        return value
+
+
+def _cache_put(items):
+    with _cache_lock:
+        for key, value in items:
+            _cache[key] = value
+            _cache.move_to_end(key)
+        while len(_cache) > CACHE_SIZE:
+            _cache.popitem(last=False)
+
+
+def clear_cache():
+    with _cache_lock:
+        _cache.clear()
+
+
+@profiled("sentiment.score_batch")
+def score_batch(texts, backend="textblob", n_jobs=None):
+    """
+    Score many texts at once and return a float NumPy array.
+
+    Scores are memoized per backend by text hash in a bounded LRU, so
+    repeated headlines are scored once. When a batch has at least
+    POOL_THRESHOLD unseen texts they are scored on a process pool
+    (n_jobs workers, default all cores; n_jobs=1 keeps it in-process).
+    """
+
+    scorer = SCORERS[backend]
+    texts = ["" if t is None else str(t) for t in texts]
+    scores = np.zeros(len(texts))
+
+    missing = {}
+    for i, text in enumerate(texts):
+        key = _text_key(backend, text)
+        value = _cache_get(key)
+
+        if value is None:
+            missing.setdefault(key, (text, []))[1].append(i)
+        else:
+            scores[i] = value
+
+    if not missing:
+        return scores
+
+    keys = list(missing)
+    pending = [missing[k][0] for k in keys]
+
+    if n_jobs is None:
+        n_jobs = os.cpu_count() or 1
+
+    if n_jobs > 1 and len(pending) >= POOL_THRESHOLD:
+        chunksize = max(1, len(pending) // (n_jobs * 4))
+        with ProcessPoolExecutor(max_workers=n_jobs) as pool:
+            values = list(pool.map(scorer, pending, chunksize=chunksize))
+    else:
+        values = [scorer(text) for text in pending]
+
+    for key, value in zip(keys, values):
+        scores[missing[key][1]] = value
+
+    _cache_put(zip(keys, values))
+
+    return scores
@@ -0,0 +1,91 @@
+"""
+Per-bar sentiment time series built from timestamped article polarities.
+
+Articles are sorted by publication time and reduced to running totals
+(cumulative polarity sum and article count). An as-of merge against the
+bar timestamps then gives, for every bar, the totals of all news published
+up to that bar, so the per-bar, rolling and decayed aggregates below are
+differences and EWMs of those totals - no per-row Python lookups.
+
+A bar only sees news published at or before its timestamp, so the
+features carry no lookahead.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def articles_frame(articles, polarities):
+    """
+    Build a (published_at, polarity) frame from NewsAPI-style article
+    dicts and their polarity scores. Articles without a timestamp are dropped.
+    """
+
+    df = pd.DataFrame({
+        "published_at": pd.to_datetime(
+            [a.get("publishedAt") for a in articles], utc=True, errors="coerce"
+        ),
+        "polarity": np.asarray(polarities, dtype=float),
+    })
+
+    return df.dropna().reset_index(drop=True)
+
+
+def _utc_ns(values):
+    dt = pd.to_datetime(pd.Series(values), utc=True)
+    return dt.astype("datetime64[ns, UTC]").reset_index(drop=True)
+
+
+def _lag(values, k):
+    lagged = np.zeros_like(values)
+    if k < len(values):
+        lagged[k:] = values[:len(values) - k]
+    return lagged
+
+
+def sentiment_features(bar_times, news_df, windows=(3, 10), halflife=3):
+    """
+    Aggregate article polarity onto bars (bar_times sorted ascending).
+
+    Returns a frame aligned row-for-row with bar_times containing:
+    - news_count: articles published since the previous bar
+    - sentiment_bar: mean polarity of those articles (0 without news)
+    - sentiment_mean_{w}: mean polarity over the last w bars
+    - sentiment: exponentially decayed per-bar polarity (halflife in
+      bars), which carries news forward and fades it towards neutral
+    """
+
+    bars = pd.DataFrame({"datetime": _utc_ns(bar_times)})
+
+    news = news_df.sort_values("published_at", kind="stable")
+    totals = pd.DataFrame({
+        "datetime": _utc_ns(news["published_at"]),
+        "cum_sum": news["polarity"].to_numpy(dtype=float).cumsum(),
+        "cum_count": np.arange(1, len(news) + 1, dtype=float),
+    })
+
+    merged = pd.merge_asof(bars, totals, on="datetime", direction="backward")
+
+    cum_sum = merged["cum_sum"].fillna(0).to_numpy()
+    cum_count = merged["cum_count"].fillna(0).to_numpy()
+
+    bar_sum = np.diff(cum_sum, prepend=0.0)
+    bar_count = np.diff(cum_count, prepend=0.0)
+
+    out = pd.DataFrame(index=bars.index)
+    out["news_count"] = bar_count
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out["sentiment_bar"] = np.where(bar_count > 0, bar_sum / bar_count, 0.0)
+
+        for w in windows:
+            s = cum_sum - _lag(cum_sum, w)
+            c = cum_count - _lag(cum_count, w)
+            out[f"sentiment_mean_{w}"] = np.where(c > 0, s / c, 0.0)
+
+    # Bars without news count as neutral, so old news fades out
+    out["sentiment"] = (
+        out["sentiment_bar"].ewm(halflife=halflife, adjust=False).mean()
+    )
+
+    return out
@@ -1,3 +1,12 @@
+import numpy as np
+import pandas as pd
+
+# Signal codes (int8)
+SELL, HOLD, BUY = -1, 0, 1
+
+_LABELS = np.array(["SELL", "HOLD", "BUY"])
+
+
 def generate_signal(prediction, confidence, threshold=0.60):
     if confidence is None:
         return "HOLD"
@@ -6,3 +15,77 @@ def generate_signal(prediction, confidence, threshold=0.60):
         return "BUY" if prediction == 1 else "SELL"
     else:
         return "HOLD"
+
+
+def generate_signals(
+    predictions,
+    confidences,
+    threshold=0.60,
+    exit_threshold=None,
+    min_hold=0
+):
+    """
+    Vectorized generate_signal over whole arrays.
+
+    predictions / confidences are 1-D (time) or 2-D (time x symbols)
+    arrays, Series or DataFrames. Returns int8 codes (BUY=1, SELL=-1,
+    HOLD=0) of the same shape; pandas inputs come back as pandas.
+
+    With the defaults every bar matches generate_signal. Optional rules:
+    - exit_threshold: hysteresis band. A position is entered when
+      confidence >= threshold and kept until confidence drops below
+      exit_threshold (< threshold)
+    - min_hold: once entered, a position is held for at least this many
+      bars before it can be closed or flipped
+    """
+
+    like = predictions if isinstance(predictions, (pd.Series, pd.DataFrame)) else None
+
+    pred = np.asarray(predictions, dtype=float)
+    conf = np.asarray(confidences, dtype=float)
+
+    # NaN confidence never triggers an entry (generate_signal(..., None))
+    enter = conf >= threshold
+    direction = np.where(pred == 1, BUY, SELL).astype(np.int8)
+    signals = np.where(enter, direction, HOLD).astype(np.int8)
+
+    if exit_threshold is not None:
+        # Entries set the state, exits clear it, the band carries it forward
+        state = np.where(enter, signals, np.where(conf >= exit_threshold, np.nan, HOLD))
+        state = pd.DataFrame(state.reshape(len(state), -1)).ffill().fillna(HOLD).to_numpy()
+        signals = state.reshape(signals.shape).astype(np.int8)
+
+    if min_hold > 1:
+        signals = _apply_min_hold(signals, min_hold)
+
+    if isinstance(like, pd.DataFrame):
+        return pd.DataFrame(signals, index=like.index, columns=like.columns)
+    if isinstance(like, pd.Series):
+        return pd.Series(signals, index=like.index, name="signal")
+
+    return signals
+
+
+def _apply_min_hold(signals, min_hold):
+    """Keep each new position for min_hold bars (loop over time, vectorized over symbols)."""
+
+    flat = signals.reshape(len(signals), -1)
+    out = np.empty_like(flat)
+
+    held = np.zeros(flat.shape[1], dtype=np.int8)
+    age = np.zeros(flat.shape[1], dtype=np.int64)
+
+    for t in range(len(flat)):
+        locked = (held != HOLD) & (age < min_hold)
+        current = np.where(locked, held, flat[t])
+
+        age = np.where(current == held, age + 1, 1)
+        held = current
+        out[t] = current
+
+    return out.reshape(signals.shape)
+
+
+def signal_labels(signals):
+    """Map int8 signal codes to 'BUY' / 'SELL' / 'HOLD' strings."""
+    return _LABELS[np.asarray(signals, dtype=np.int64) + 1]
@@ -0,0 +1,227 @@
+"""
+Walk-forward hyperparameter search with successive halving.
+
+Candidates are scored the way the strategy is used: each one is run
+through walk-forward refits over a sequence of out-of-sample folds, the
+fold predictions are backtested with the backtest_strategy kernel, and
+the objective is the mean Sharpe ratio across the folds seen so far.
+
+Successive halving keeps the search affordable: every candidate is
+first scored on min_folds folds, then only the best 1 / eta move on to
+a budget eta times larger, until the survivors have seen every fold.
+Fold evaluations of all live candidates run in parallel on a process
+pool that receives the feature arrays once.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import ParameterGrid
+
+from core.backtest import backtest_arrays
+from core.ml_model import FEATURE_COLUMNS
+from core.walk_forward import score_range
+
+# Default search spaces per model type
+SEARCH_SPACES = {
+    "lr": {
+        "C": [0.01, 0.03, 0.1, 0.3, 1.0, 3.0, 10.0],
+        "class_weight": [None, "balanced"],
+    },
+    "rf": {
+        "n_estimators": [50, 100, 200],
+        "max_depth": [3, 5, 8],
+        "min_samples_leaf": [1, 5, 20],
+        "max_features": ["sqrt", None],
+    },
+    "hgb": {
+        "learning_rate": [0.02, 0.05, 0.1],
+        "max_iter": [50, 100, 200],
+        "max_leaf_nodes": [7, 15, 31],
+        "l2_regularization": [0.0, 1.0],
+    },
+}
+
+# Read-only arrays shared with pool workers (set once per process)
+_TUNING_DATA = {}
+
+
+def _init_worker(data):
+    _TUNING_DATA.update(data)
+
+
+def sample_candidates(space, n_candidates=None, seed=0):
+    """Every configuration of space, or a seeded random subset of n_candidates."""
+
+    grid = list(ParameterGrid(space))
+
+    if n_candidates is None or n_candidates >= len(grid):
+        return grid
+
+    rng = np.random.default_rng(seed)
+    return [grid[k] for k in sorted(rng.choice(len(grid), n_candidates, replace=False))]
+
+
+def make_folds(n_rows, n_folds, train_ratio=0.5):
+    """(start, end) row ranges of n_folds equal out-of-sample folds after the first training window."""
+
+    start = int(n_rows * train_ratio)
+    edges = np.linspace(start, n_rows, n_folds + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _evaluate(params, fold, data=None):
+    """Sharpe ratio of one candidate on one fold (walk-forward + backtest)."""
+
+    data = data or _TUNING_DATA
+    start, end = fold
+
+    rows, confidence = score_range(
+        data["X"], data["y"], start, end, data["model_type"],
+        refit_every=data["refit_every"], window=data["window"],
+        params=params, calibration=data["calibration"]
+    )
+
+    if not len(rows):
+        return np.nan
+
+    bt = backtest_arrays(
+        data["ret"][rows],
+        data["vol"][rows],
+        (confidence > 0.5).astype(float),
+        confidence,
+        cost=data["cost"],
+        conf_threshold=data["conf_threshold"],
+        max_drawdown_limit=data["max_drawdown_limit"]
+    )
+
+    returns = bt["strategy_return"]
+    std = returns.std(ddof=1) if len(returns) > 1 else 0.0
+    return 0.0 if std == 0 else returns.mean() / std * np.sqrt(252)
+
+
+def successive_halving(
+    df,
+    model_type="lr",
+    space=None,
+    n_candidates=None,
+    n_folds=6,
+    min_folds=1,
+    eta=3,
+    train_ratio=0.5,
+    refit_every=5,
+    window=None,
+    features=None,
+    calibration=None,
+    cost=0.001,
+    conf_threshold=0.52,
+    max_drawdown_limit=0.30,
+    n_jobs=1,
+    seed=0
+):
+    """
+    Search model hyperparameters on walk-forward folds.
+
+    df is a create_features frame. The rows after train_ratio are split
+    into n_folds consecutive folds; each fold is predicted with
+    walk-forward refits every refit_every bars (training on all earlier
+    rows, or the last window rows) and backtested with the
+    backtest_strategy rules. A candidate's score is its mean fold Sharpe.
+
+    space: {param: values} (default SEARCH_SPACES[model_type]);
+    n_candidates samples that many configurations instead of the full
+    grid. Each rung keeps the best ceil(k / eta) candidates and grows
+    the fold budget by eta, starting from min_folds.
+    calibration: evaluate calibrated models (see ml_model.build_model).
+    n_jobs: worker processes for the fold evaluations (-1 = all cores).
+
+    Returns (best_params, history): history has one row per candidate
+    and rung with the folds used and the score.
+    """
+
+    features = features or FEATURE_COLUMNS
+    space = space if space is not None else SEARCH_SPACES[model_type]
+
+    df = df.dropna(subset=features + ["target", "return", "volatility"]).reset_index(drop=True)
+
+    data = {
+        "X": df[features].to_numpy(dtype=float),
+        "y": df["target"].to_numpy(),
+        "ret": df["return"].to_numpy(dtype=float),
+        "vol": df["volatility"].to_numpy(dtype=float),
+        "model_type": model_type,
+        "refit_every": refit_every,
+        "window": window,
+        "calibration": calibration,
+        "cost": cost,
+        "conf_threshold": conf_threshold,
+        "max_drawdown_limit": max_drawdown_limit,
+    }
+
+    folds = make_folds(len(df), n_folds, train_ratio)
+    candidates = sample_candidates(space, n_candidates, seed)
+
+    if not candidates:
+        raise ValueError("Empty search space")
+
+    if n_jobs is None:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    pool = None
+    if n_jobs > 1:
+        pool = ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(data,))
+
+    # scores[c][f]: Sharpe of candidate c on fold f
+    scores = [dict() for _ in candidates]
+    alive = list(range(len(candidates)))
+    budget = min(min_folds, n_folds)
+    history = []
+    rung = 0
+
+    try:
+        while True:
+            tasks = [(c, f) for c in alive for f in range(budget) if f not in scores[c]]
+
+            if pool is not None:
+                futures = [pool.submit(_evaluate, candidates[c], folds[f]) for c, f in tasks]
+                values = [future.result() for future in futures]
+            else:
+                values = [_evaluate(candidates[c], folds[f], data) for c, f in tasks]
+
+            for (c, f), value in zip(tasks, values):
+                scores[c][f] = value
+
+            ranked = []
+            for c in alive:
+                fold_scores = [scores[c][f] for f in range(budget)]
+                score = np.nanmean(fold_scores) if not np.all(np.isnan(fold_scores)) else -np.inf
+
+                ranked.append((score, c))
+                history.append({
+                    "rung": rung,
+                    "candidate": c,
+                    "params": candidates[c],
+                    "folds": budget,
+                    "score": score,
+                })
+
+            ranked.sort(key=lambda item: item[0], reverse=True)
+
+            if budget >= n_folds or len(alive) == 1:
+                break
+
+            alive = [c for _, c in ranked[:max(1, math.ceil(len(alive) / eta))]]
+            budget = min(n_folds, budget * eta)
+            rung += 1
+
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    best = ranked[0][1]
+    return candidates[best], pd.DataFrame(history)
@@ -1,44 +1,208 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
 import pandas as pd
-from core.ml_model import train_predict
+from core.ml_model import FEATURE_COLUMNS, MIN_TRAIN_ROWS, build_model, fit_arrays
+from core.profiling import profiled, stage
+
+# Read-only feature arrays shared with pool workers (set once per process)
+_WORKER_DATA = {}
+
+
+def _init_worker(X, y, store):
+    _WORKER_DATA["X"] = X
+    _WORKER_DATA["y"] = y
+    _WORKER_DATA["store"] = store
+
+
+def _score_blocks(blocks, model_type, refit_every, window, warm_start, symbol,
+                  X=None, y=None, store=None, params=None, calibration=None):
+    """
+    Fit and score a chunk of refit blocks.
+
+    A block starting at bar i refits at the close of bar i - 1 on every
+    row whose target is already known (rows before i - 1), then scores the
+    held-out rows i - 1 ... i + refit_every - 2. Each forecast is stored on
+    the following bar, the one it trades.
+    Returns a list of (bar index, confidence) pairs.
+    """
+
+    if X is None:
+        X = _WORKER_DATA["X"]
+        y = _WORKER_DATA["y"]
+        store = _WORKER_DATA["store"]
+
+    n = len(X)
+    results = []
+    model = None
+
+    for i in blocks:
+        stop = i - 1
+        start = 0 if window is None else max(0, stop - window)
+
+        if stop - start < MIN_TRAIN_ROWS:
+            model = None
+            continue
+
+        if model is None and warm_start:
+            model, _ = build_model(model_type, warm_start=True, params=params)
+
+        with stage("walk_forward.fit"):
+            model = fit_arrays(
+                X[start:stop], y[start:stop], model_type,
+                model=model if warm_start else None,
+                store=store,
+                symbol=symbol,
+                params=params,
+                calibration=calibration
+            )
+
+        # Score only the held-out rows
+        end = min(i + refit_every, n)
+        with stage("walk_forward.score"):
+            proba = model.predict_proba(X[stop:end - 1])[:, 1]
+
+        results.extend(zip(range(i, end), proba))
+
+    return results
+
 
-def walk_forward_validation(df, model_type="lr", train_ratio=0.7):
+def score_range(X, y, start, end, model_type="lr", refit_every=1, window=None,
+                params=None, calibration=None, store=None, symbol=None):
+    """
+    Walk-forward confidences for bars start ... end - 1 of the feature
+    arrays X / y, refitting every refit_every bars on the rows before each
+    block (or the last window rows), exactly as walk_forward_validation
+    does for its held-out bars.
+
+    Returns (bar indices, confidences) as arrays; bars without enough
+    training rows are left out.
+    """
+
+    results = _score_blocks(
+        range(start, end, refit_every), model_type, refit_every, window, False, symbol,
+        X[:end], y[:end], store, params, calibration
+    )
+
+    if not results:
+        return np.array([], dtype=int), np.array([], dtype=float)
+
+    rows, confidence = zip(*results)
+    return np.asarray(rows), np.asarray(confidence)
+
+
+@profiled("walk_forward")
+def walk_forward_validation(
+    df,
+    model_type="lr",
+    train_ratio=0.7,
+    refit_every=1,
+    window=None,
+    warm_start=False,
+    n_jobs=1,
+    chunksize=None,
+    features=None,
+    store=None,
+    symbol=None,
+    params=None,
+    calibration=None
+):
     """
     Perform walk-forward (rolling window) validation.
     Returns dataframe with predictions & confidence.
+
+    Incremental engine:
+    - refit_every: retrain every k bars, scoring the bars in between
+      with the last fitted model (1 = refit on every bar)
+    - window: None for an expanding training window, or the number of
+      trailing rows kept in a fixed rolling window
+    - warm_start: start each refit from the previous solution where the
+      estimator supports it (Logistic Regression)
+
+    Each bar's prediction is made at the close of the previous bar: the
+    model is fitted on the rows whose next-bar target was already known,
+    and only the held-out newest row is scored. With refit_every=1 this
+    matches ml_model.fit + ml_model.predict_proba on every bar.
+
+    Parallel execution:
+    - n_jobs: number of worker processes for the refits (-1 = all cores)
+    - chunksize: refit blocks per task (default spreads ~4 tasks per worker)
+
+    Workers receive the feature arrays once at start-up and only block
+    indices per task. Results are identical to the serial run.
+
+    features: model input columns (default FEATURE_COLUMNS)
+    store / symbol: reuse fitted models from a ModelStore, so repeat runs
+    over the same windows skip training
+    params: estimator hyperparameters passed to build_model (e.g. the
+    best configuration found by core.tuning)
+    calibration: "sigmoid" / "isotonic" to calibrate each refit's
+    probabilities on time-ordered splits of its own training window
     """
 
+    if refit_every < 1:
+        raise ValueError("refit_every must be >= 1")
+
+    if n_jobs is None:
+        n_jobs = 1
+    elif n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+
+    if warm_start and n_jobs > 1:
+        raise ValueError("warm_start refits are sequential; use n_jobs=1")
+
+    if warm_start and calibration is not None:
+        raise ValueError("warm_start cannot be combined with calibration")
+
+    features = features or FEATURE_COLUMNS
+
     df = df.copy()
-    df = df.dropna().reset_index(drop=True)
+    df = df.dropna(subset=features + ["target"]).reset_index(drop=True)
 
     n = len(df)
     split = int(n * train_ratio)
 
-    predictions = []
-    confidences = []
+    X = df[features].to_numpy(dtype=float)
+    y = df["target"].to_numpy()
 
-    for i in range(split, n):
-        train_df = df.iloc[:i]
-        test_df = df.iloc[i:i+1]
+    blocks = list(range(split, n, refit_every))
 
-        result = train_predict(train_df, model_type)
+    if n_jobs == 1 or len(blocks) < 2:
+        results = _score_blocks(
+            blocks, model_type, refit_every, window, warm_start, symbol, X, y, store,
+            params, calibration
+        )
+    else:
+        n_jobs = min(n_jobs, len(blocks))
 
-        if result[0] is None:
-            predictions.append(np.nan)
-            confidences.append(np.nan)
-            continue
+        if chunksize is None:
+            chunksize = max(1, -(-len(blocks) // (n_jobs * 4)))
+
+        chunks = [blocks[k:k + chunksize] for k in range(0, len(blocks), chunksize)]
 
-        _, proba, _, _, _, _ = result
+        with ProcessPoolExecutor(
+            max_workers=n_jobs,
+            initializer=_init_worker,
+            initargs=(X, y, store)
+        ) as pool:
+            futures = [
+                pool.submit(
+                    _score_blocks, chunk, model_type, refit_every, window, False, symbol,
+                    params=params, calibration=calibration
+                )
+                for chunk in chunks
+            ]
+            results = [r for f in futures for r in f.result()]
 
-        # Probability for this step
-        confidence = proba[-1]
-        prediction = int(confidence > 0.5)
+    predictions = np.full(n, np.nan)
+    confidences = np.full(n, np.nan)
 
-        predictions.append(prediction)
-        confidences.append(confidence)
+    for i, confidence in results:
+        predictions[i] = int(confidence > 0.5)
+        confidences[i] = confidence
 
-    # Pad beginning with NaN
-    df["prediction"] = [np.nan]*split + predictions
-    df["confidence"] = [np.nan]*split + confidences
+    df["prediction"] = predictions
+    df["confidence"] = confidences
 
     return df
@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+
+import pytest
+import requests
+
+from core.acquisition import Acquirer, CallableProvider, TokenBucket, acquire
+from core.http import backoff_delay, call_with_retries, is_transient
+
+
+def run(coro):
+    return asyncio.run(coro)
+
+
+def test_token_bucket_limits_rate():
+    async def take(n):
+        bucket = TokenBucket(rate=20, burst=2)
+        start = time.monotonic()
+        for _ in range(n):
+            await bucket.acquire()
+        return time.monotonic() - start
+
+    # Two tokens are free, the other four arrive at 20 per second
+    assert run(take(6)) >= 0.18
+
+
+def test_acquirer_respects_provider_rate():
+    provider = CallableProvider("p", lambda key: key, rate=20, burst=1)
+
+    async def main():
+        async with Acquirer([provider]) as acquirer:
+            start = time.monotonic()
+            results = await acquirer.fetch_many([("p", k) for k in range(5)])
+            return results, time.monotonic() - start
+
+    results, elapsed = run(main())
+
+    assert results == [0, 1, 2, 3, 4]
+    assert elapsed >= 0.18
+
+
+def test_identical_inflight_requests_are_coalesced():
+    calls = []
+    lock = threading.Lock()
+
+    def slow(key):
+        with lock:
+            calls.append(key)
+        time.sleep(0.05)
+        return key.lower()
+
+    provider = CallableProvider("p", slow)
+
+    async def main():
+        async with Acquirer([provider]) as acquirer:
+            results = await acquirer.fetch_many([("p", "AAPL")] * 5 + [("p", "MSFT")])
+            return results, acquirer.stats
+
+    results, stats = run(main())
+
+    assert results == ["aapl"] * 5 + ["msft"]
+    assert sorted(calls) == ["AAPL", "MSFT"]
+    assert stats["coalesced"] == 4
+    assert stats["requests"] == 2
+
+
+def test_transient_errors_are_retried():
+    attempts = []
+
+    def flaky(key):
+        attempts.append(key)
+        if len(attempts) < 3:
+            raise requests.ConnectionError("reset")
+        return "ok"
+
+    provider = CallableProvider("p", flaky, retries=3)
+    provider.base_delay = 0.001
+
+    async def main():
+        async with Acquirer([provider]) as acquirer:
+            return await acquirer.fetch("p", "k"), acquirer.stats
+
+    result, stats = run(main())
+
+    assert result == "ok"
+    assert stats["retries"] == 2 and stats["errors"] == 0
+
+
+def test_permanent_errors_are_returned_not_retried():
+    def broken(key):
+        raise ValueError("bad key")
+
+    provider = CallableProvider("p", broken, retries=3)
+
+    async def main():
+        async with Acquirer([provider]) as acquirer:
+            return await acquirer.fetch_many([("p", "k")]), acquirer.stats
+
+    (result,), stats = run(main())
+
+    assert isinstance(result, ValueError)
+    assert stats["retries"] == 0 and stats["errors"] == 1
+
+
+def test_acquire_merges_providers_per_symbol():
+    prices = CallableProvider("prices", lambda s: f"bars:{s}")
+
+    def news(query):
+        if query == "BTC":
+            raise ValueError("no news")
+        return [query]
+
+    results = run(acquire(
+        ["AAPL", "BTC-USD", "AAPL"],
+        price_provider=prices,
+        news_provider=CallableProvider("news", news)
+    ))
+
+    assert list(results) == ["AAPL", "BTC-USD"]
+    assert results["AAPL"] == {"prices": "bars:AAPL", "articles": ["AAPL"], "errors": {}}
+    assert results["BTC-USD"]["prices"] == "bars:BTC-USD"
+    assert results["BTC-USD"]["errors"] == {"news": "no news"}
+
+
+def test_is_transient():
+    response = requests.Response()
+    response.status_code = 429
+    assert is_transient(requests.HTTPError(response=response))
+
+    response.status_code = 404
+    assert not is_transient(requests.HTTPError(response=response))
+    assert is_transient(requests.Timeout())
+    assert not is_transient(ValueError())
+
+
+def test_call_with_retries():
+    attempts = []
+
+    def flaky():
+        attempts.append(1)
+        if len(attempts) < 2:
+            raise requests.Timeout()
+        return "ok"
+
+    assert call_with_retries(flaky, base_delay=0.001) == "ok"
+    assert len(attempts) == 2
+
+    with pytest.raises(ValueError):
+        call_with_retries(lambda: int("x"), base_delay=0.001)
+
+
+def test_backoff_delay_is_capped():
+    for attempt in range(10):
+        assert 0 <= backoff_delay(attempt, 0.5, max_delay=2.0) <= 2.0
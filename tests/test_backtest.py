@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import backtest
+from core.backtest import backtest_arrays, backtest_strategy, backtest_sweep
+from core.risk_metrics import max_drawdown, sharpe_ratio
+
+KEYS = ("position_size", "strategy_return", "cum_strategy", "cum_market", "peak", "drawdown")
+
+
+def market(n=500, seed=3, drift=0.0):
+    rng = np.random.default_rng(seed)
+    ret = rng.normal(drift, 0.02, n)
+    return pd.DataFrame({
+        "return": ret,
+        "volatility": np.abs(rng.normal(0.6, 0.2, n)),
+        "prediction": rng.integers(0, 2, n).astype(float),
+        "confidence": rng.uniform(0.4, 0.9, n),
+    })
+
+
+def kernel_args(df, cost=0.001, conf_threshold=0.52, limit=0.30):
+    return (
+        df["return"].to_numpy(), df["volatility"].to_numpy(),
+        df["prediction"].to_numpy(), df["confidence"].to_numpy(),
+        cost, conf_threshold, limit,
+    )
+
+
+@pytest.mark.parametrize("limit", [0.30, 0.05])
+def test_numpy_fallback_matches_loop(limit):
+    args = kernel_args(market(), limit=limit)
+
+    loop = backtest._backtest_loop(*args, backtest._bar_step)
+    vectorized = backtest._backtest_numpy(*args)
+
+    for key, a, b in zip(KEYS, loop, vectorized):
+        np.testing.assert_allclose(a, b, rtol=1e-10, err_msg=key)
+
+
+def test_stop_rule_trades_through_breaching_bar():
+    args = kernel_args(market(), limit=0.05)
+
+    out = dict(zip(KEYS, backtest._backtest_numpy(*args)))
+
+    stop = np.flatnonzero(out["drawdown"] > 0.05)[0]
+    assert out["position_size"][stop] > 0 or out["strategy_return"][stop] != 0
+    assert not out["position_size"][stop + 1:].any()
+    assert not out["strategy_return"][stop + 1:].any()
+
+
+@pytest.mark.parametrize("limit", [0.30, 0.05])
+def test_compiled_kernel_matches_numpy(limit):
+    pytest.importorskip("numba")
+    args = kernel_args(market(seed=11), limit=limit)
+
+    compiled = backtest_arrays(*args)
+    vectorized = backtest._backtest_numpy(*args)
+
+    for key, b in zip(KEYS, vectorized):
+        np.testing.assert_allclose(compiled[key], b, rtol=1e-10, err_msg=key)
+
+
+def test_sweep_matches_per_parameter_loop():
+    df = market(n=400, seed=5)
+    df.loc[df.index[::50], "confidence"] = np.nan
+    thresholds, costs, limits = (0.5, 0.55, 0.6, 0.7), (0.0, 0.002), (0.05, 0.15, 0.3, 1.0)
+
+    sweep = backtest_sweep(df, thresholds, costs, limits)
+
+    expected = []
+    for thr in thresholds:
+        for cost in costs:
+            for limit in limits:
+                bt = backtest_strategy(df, cost=cost, conf_threshold=thr, max_drawdown_limit=limit)
+                expected.append((
+                    thr, cost, limit,
+                    sharpe_ratio(bt["strategy_return"]),
+                    max_drawdown(bt["cum_strategy"]),
+                    bt["cum_strategy"].iloc[-1],
+                ))
+    expected = pd.DataFrame(expected, columns=sweep.columns)
+
+    pd.testing.assert_frame_equal(sweep, expected, rtol=1e-9, atol=1e-12)
+
+
+def test_sweep_of_empty_frame():
+    sweep = backtest_sweep(market(n=0), (0.5, 0.6), (0.001,), (0.3,))
+
+    assert len(sweep) == 2
+    assert (sweep["final_equity"] == 1).all()
+
+
+def test_held_signal_keeps_entry_size():
+    df = market(6)
+    df["prediction"] = 1.0
+    # Entry clears conf_threshold, later bars do not
+    df["confidence"] = [0.9, 0.45, 0.45, 0.45, 0.45, 0.45]
+    signals = np.array([1, 1, 1, 0, 0, 0], dtype=np.int8)
+
+    result = backtest_strategy(df, signals=signals, max_drawdown_limit=1.0)
+
+    size = result["position_size"].to_numpy()
+    base = backtest_strategy(df.assign(confidence=0.9), max_drawdown_limit=1.0)["position_size"]
+    np.testing.assert_allclose(size[:3], base[:3])
+    assert not size[3:].any()
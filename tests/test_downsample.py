@@ -0,0 +1,22 @@
+import numpy as np
+import pandas as pd
+
+from core.downsample import lttb
+
+
+def test_lttb_keeps_input_types_and_endpoints():
+    x = pd.date_range("2020-01-01", periods=5000, freq="h")
+    y = pd.Series(np.sin(np.arange(5000) / 50.0))
+
+    xs, ys = lttb(x, y, 200)
+
+    assert isinstance(xs, pd.DatetimeIndex) and isinstance(ys, pd.Series)
+    assert len(xs) == len(ys) == 200
+    assert xs[0] == x[0] and xs[-1] == x[-1]
+
+
+def test_lttb_on_arrays():
+    xs, ys = lttb(np.arange(1000), np.random.default_rng(0).normal(size=1000), 50)
+
+    assert isinstance(xs, np.ndarray) and len(xs) == 50
+    assert np.all(np.diff(xs) > 0)
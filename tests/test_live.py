@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from benchmarks.synthetic import synthetic_ohlc
+from core.backtest import backtest_strategy
+from core.feature_engineering import create_features
+from core.live import OnlineEngine, replay
+from core.ml_model import FEATURE_COLUMNS
+
+
+@pytest.fixture
+def bars():
+    return synthetic_ohlc(300, seed=6, freq="D")
+
+
+def test_replay_matches_backtest(bars):
+    features_df = create_features(bars, 0.0)
+    X = features_df[FEATURE_COLUMNS].to_numpy()
+    model = LogisticRegression().fit(X, features_df["target"])
+
+    states = replay(bars, OnlineEngine(model, max_drawdown_limit=0.05))
+
+    # Same forecasts, made at each close and traded on the next bar
+    proba = model.predict_proba(X)[:, 1]
+    df = features_df.assign(confidence=proba, prediction=(proba > 0.5).astype(int))
+    df[["prediction", "confidence"]] = df[["prediction", "confidence"]].shift(1)
+    expected = backtest_strategy(df, max_drawdown_limit=0.05)
+
+    live = states.set_index("datetime").loc[expected["datetime"]]
+    for column in ("position_size", "strategy_return", "cum_strategy", "drawdown"):
+        np.testing.assert_allclose(live[column], expected[column], rtol=1e-9, atol=1e-12, err_msg=column)
+
+
+def test_unsupported_features_rejected():
+    with pytest.raises(ValueError, match="volatility_20"):
+        OnlineEngine(LogisticRegression(), features=["return", "volatility_20"])
@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.fetch_market_data import FrameSource, fetch_bars
+from core.market_cache import OHLCCache
+
+
+def bars(start, n, tz="America/New_York"):
+    dt = pd.bdate_range(start, periods=n, tz=tz, unit="ns") + pd.Timedelta(hours=9, minutes=30)
+    close = 100 + np.arange(n, dtype=float)
+
+    return pd.DataFrame({
+        "datetime": dt,
+        "open": close - 0.5,
+        "high": close + 1,
+        "low": close - 1,
+        "close": close,
+        "volume": 1000.0
+    })
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return OHLCCache(str(tmp_path / "ohlc.sqlite"))
+
+
+def test_miss_then_hit(cache):
+    source = FrameSource({"AAA": bars("2024-01-01", 60)})
+
+    first = fetch_bars("AAA", "1mo", source=source, cache=cache)
+    second = fetch_bars("AAA", "1mo", source=source, cache=cache)
+
+    assert cache.stats == {"hits": 1, "misses": 1, "refreshes": 0}
+    assert len(source.calls) == 1
+    pd.testing.assert_frame_equal(first, second)
+
+
+def test_matches_uncached_read_for_historical_data(cache):
+    source = FrameSource({"AAA": bars("2019-01-01", 300)})
+
+    direct = fetch_bars("AAA", "1y", source=source, use_cache=False)
+    cached = fetch_bars("AAA", "1y", source=source, cache=cache)
+    again = fetch_bars("AAA", "1y", source=source, cache=cache)
+
+    assert len(direct) > 200
+    pd.testing.assert_frame_equal(cached, direct)
+    pd.testing.assert_frame_equal(again, direct)
+
+
+def test_refresh_requests_only_new_bars(cache):
+    frames = {"AAA": bars("2024-01-01", 40)}
+    source = FrameSource(frames)
+
+    fetch_bars("AAA", "1mo", source=source, cache=cache)
+    before = fetch_bars("AAA", "1mo", source=source, cache=cache)
+
+    frames["AAA"] = bars("2024-01-01", 43)
+    after = fetch_bars("AAA", "1mo", source=source, cache=cache, max_age=0)
+
+    assert cache.stats["refreshes"] == 1
+    symbol, interval, period, start = source.calls[-1]
+    assert period is None and start == before["datetime"].iloc[-1]
+
+    # The window slides forward by the new bars
+    assert len(after) == len(before)
+    assert after["datetime"].iloc[-1] == frames["AAA"]["datetime"].iloc[-1]
+    assert after["datetime"].iloc[0] > before["datetime"].iloc[0]
+
+
+def test_trading_day_period_survives_weekend(cache):
+    # 2024-01-05 is a Friday
+    frames = {"AAA": bars("2023-12-01", 26)}
+    assert frames["AAA"]["datetime"].iloc[-1].day_name() == "Friday"
+    source = FrameSource(frames)
+
+    assert len(fetch_bars("AAA", "5d", source=source, cache=cache)) == 5
+
+    frames["AAA"] = bars("2023-12-01", 27)
+    monday = fetch_bars("AAA", "5d", source=source, cache=cache, max_age=0)
+
+    assert len(monday) == 5
+    assert monday["datetime"].iloc[-1].day_name() == "Monday"
+    pd.testing.assert_frame_equal(monday, fetch_bars("AAA", "5d", source=source, use_cache=False))
+
+
+def test_periods_share_bars_but_keep_their_windows(cache):
+    source = FrameSource({"AAA": bars("2024-01-01", 300)})
+
+    year = fetch_bars("AAA", "1y", source=source, cache=cache)
+    month = fetch_bars("AAA", "1mo", source=source, cache=cache)
+    full = fetch_bars("AAA", "max", source=source, cache=cache)
+
+    assert len(month) < len(year) < len(full) == 300
+    assert month["datetime"].iloc[-1] == full["datetime"].iloc[-1]
+
+
+def test_missing_symbol(cache):
+    assert fetch_bars("NOPE", "1mo", source=FrameSource({}), cache=cache) is None
@@ -0,0 +1,16 @@
+import pytest
+
+from core.ml_model import CALIBRATION_METHODS, MODELS, build_model, model_name
+
+
+@pytest.mark.parametrize("model_type", list(MODELS))
+@pytest.mark.parametrize("calibration", [None, *CALIBRATION_METHODS])
+def test_model_name_matches_build_model(model_type, calibration):
+    _, name = build_model(model_type, calibration=calibration)
+
+    assert model_name(model_type, calibration) == name
+
+
+def test_unknown_calibration():
+    with pytest.raises(ValueError):
+        build_model("lr", calibration="platt")
@@ -0,0 +1,108 @@
+import os
+import threading
+
+import numpy as np
+from sklearn.linear_model import LogisticRegression
+
+from core import model_store
+from core.model_store import ModelStore, model_key
+
+
+def fitted(seed):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(50, 3))
+    y = (X[:, 0] > 0).astype(int)
+    return LogisticRegression().fit(X, y), X, y
+
+
+def test_get_or_fit_reuses_stored_model(tmp_path):
+    store = ModelStore(str(tmp_path))
+    _, X, y = fitted(0)
+
+    first = store.get_or_fit("AAA", "lr", LogisticRegression(), X, y)
+    second = store.get_or_fit("AAA", "lr", LogisticRegression(), X, y)
+
+    assert store.stats["misses"] == 1 and store.stats["hits"] == 1
+    np.testing.assert_array_equal(first.coef_, second.coef_)
+
+
+def test_size_cap_holds_across_processes(tmp_path):
+    model, X, y = fitted(0)
+    size_one = ModelStore(str(tmp_path / "probe"))
+    size_one.put("probe", model)
+    size = os.path.getsize(size_one._path("probe"))
+
+    # Two stores on one directory stand in for two worker processes
+    a = ModelStore(str(tmp_path / "shared"), max_bytes=3 * size)
+    b = ModelStore(str(tmp_path / "shared"), max_bytes=3 * size)
+    a._load_index()
+    b._load_index()
+
+    for i in range(4):
+        a.put(f"a{i}", model)
+        b.put(f"b{i}", model)
+
+    on_disk = [n for n in os.listdir(a.root) if n.endswith(".joblib")]
+    assert len(on_disk) <= 3
+
+
+def test_concurrent_puts_of_one_key(tmp_path):
+    store = ModelStore(str(tmp_path))
+    model, X, y = fitted(1)
+    key = model_key("AAA", "lr", model.get_params(), X, y)
+    errors = []
+
+    def put():
+        try:
+            store.put(key, model)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=put) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert os.listdir(store.root) == [key + ".joblib"]
+    np.testing.assert_array_equal(store.get(key).coef_, model.coef_)
+
+
+def test_puts_below_the_cap_do_not_rescan(tmp_path, monkeypatch):
+    store = ModelStore(str(tmp_path))
+    model, _, _ = fitted(0)
+    store._load_index()
+
+    scans = []
+    original = store._scan
+    monkeypatch.setattr(store, "_scan", lambda: scans.append(1) or original())
+
+    for i in range(10):
+        store.put(f"k{i}", model)
+
+    assert scans == []
+    assert store._bytes == sum(os.path.getsize(store._path(f"k{i}")) for i in range(10))
+
+
+def test_periodic_rescan(tmp_path, monkeypatch):
+    monkeypatch.setattr(model_store, "RESCAN_EVERY", 3)
+    store = ModelStore(str(tmp_path))
+    model, _, _ = fitted(0)
+
+    # Written by "another process"
+    ModelStore(str(tmp_path)).put("other", model)
+
+    for i in range(3):
+        store.put(f"k{i}", model)
+
+    assert "other" in store._index
+
+
+def test_key_depends_on_sklearn_version(monkeypatch):
+    _, X, y = fitted(0)
+    before = model_key("AAA", "lr", {}, X, y)
+
+    monkeypatch.setattr(model_store.sklearn, "__version__", "0.0.0")
+
+    assert model_key("AAA", "lr", {}, X, y) != before
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core import monte_carlo as mc
+from core.monte_carlo import monte_carlo, resample_paths, stationary_bootstrap_indices
+
+
+def returns(n=300, seed=2):
+    return np.random.default_rng(seed).normal(0.0005, 0.01, n)
+
+
+def test_seeded_run_does_not_depend_on_n_jobs(monkeypatch):
+    # Small chunks so two workers actually split the paths
+    monkeypatch.setattr(mc, "CHUNK_PATHS", 250)
+
+    summary1, samples1 = monte_carlo(returns(), n_paths=1000, seed=7, n_jobs=1)
+    summary2, samples2 = monte_carlo(returns(), n_paths=1000, seed=7, n_jobs=2)
+
+    pd.testing.assert_frame_equal(samples1, samples2)
+    pd.testing.assert_frame_equal(summary1, summary2)
+
+
+def test_bootstrap_indices_step_inside_blocks():
+    n_bars, n_paths, mean_block = 250, 40, 10
+
+    idx = stationary_bootstrap_indices(n_bars, n_paths, mean_block, np.random.default_rng(3))
+
+    # Same draws as the function's own block starts
+    new_block = np.random.default_rng(3).random((n_paths, n_bars), dtype=np.float32) < 1.0 / mean_block
+    new_block[:, 0] = True
+
+    assert idx.shape == (n_paths, n_bars)
+    assert idx.min() >= 0 and idx.max() < n_bars
+
+    inside = ~new_block[:, 1:]
+    np.testing.assert_array_equal(idx[:, 1:][inside], (idx[:, :-1][inside] + 1) % n_bars)
+
+
+def test_shuffle_preserves_each_paths_returns():
+    r = returns(100)
+
+    paths = resample_paths(r, 25, method="shuffle", rng=np.random.default_rng(1))
+
+    assert paths.shape == (25, 100)
+    for path in paths:
+        np.testing.assert_array_equal(np.sort(path), np.sort(r))
+    assert not (paths == r).all(axis=1).any()
+
+
+def test_unknown_method():
+    with pytest.raises(ValueError):
+        resample_paths(returns(), 10, method="jackknife")
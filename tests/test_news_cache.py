@@ -0,0 +1,91 @@
+import time
+
+import pytest
+
+from core import news_cache
+from core.news_cache import NewsCache, dedupe_articles, story_key
+
+
+def article(title, url=None, description=""):
+    return {"title": title, "url": url, "description": description}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return NewsCache(str(tmp_path / "news.sqlite"))
+
+
+def test_syndicated_copies_share_a_story():
+    original = article("Apple beats earnings estimates", "https://a.example/1")
+    copy = article("Apple Beats Earnings Estimates - Yahoo Finance", "https://b.example/2")
+    other = article("Apple misses earnings estimates", "https://c.example/3")
+
+    assert story_key(original) == story_key(copy)
+    assert dedupe_articles([original, copy, other]) == [original, other]
+
+
+def test_query_is_served_until_ttl_expires(cache, monkeypatch):
+    articles = [article("One", "https://x/1"), article("Two", "https://x/2")]
+    cache.put_query("AAPL", 10, articles)
+
+    assert cache.get_query("AAPL", 10, ttl=60) == articles
+    assert cache.get_query("AAPL", 20, ttl=60) is None
+
+    now = time.time()
+    monkeypatch.setattr(news_cache.time, "time", lambda: now + 61)
+    assert cache.get_query("AAPL", 10, ttl=60) is None
+
+
+def test_articles_without_url_are_keyed_by_content(cache):
+    articles = [article("No link", description="body")]
+    cache.put_query("X", 10, articles)
+
+    assert cache.get_query("X", 10, ttl=60) == articles
+
+
+def test_polarities_are_scored_once_per_story(cache):
+    scored = []
+
+    def score(texts):
+        scored.extend(texts)
+        return [0.5] * len(texts)
+
+    first = [article("Tesla rallies", "https://a/1"), article("Tesla rallies - Reuters", "https://b/1")]
+    assert cache.polarities(first, score) == [0.5, 0.5]
+    assert len(scored) == 1
+
+    # A new copy of a known story and a known article reuse stored scores
+    again = [article("TESLA RALLIES | MarketWatch", "https://c/1"), first[0]]
+    assert cache.polarities(again, score) == [0.5, 0.5]
+    assert len(scored) == 1
+    assert cache.stats["scored"] == 1 and cache.stats["score_hits"] == 3
+
+
+def test_refetch_keeps_stored_polarity(cache):
+    a = article("Fed holds rates", "https://x/fed")
+    cache.polarities([a], lambda texts: [-0.2])
+
+    cache.put_query("fed", 10, [a])
+
+    assert cache.polarities([a], lambda texts: pytest.fail("rescored")) == [-0.2]
+
+
+def test_edited_article_is_rescored(cache):
+    a = article("Acme posts record profit", "https://x/acme")
+    cache.put_query("acme", 10, [a])
+    assert cache.polarities([a], lambda texts: [0.8]) == [0.8]
+
+    edited = article("Acme withdraws profit guidance", "https://x/acme")
+    cache.put_query("acme", 10, [edited])
+
+    assert cache.polarities([edited], lambda texts: [-0.6]) == [-0.6]
+    assert cache.polarities([edited], lambda texts: pytest.fail("rescored")) == [-0.6]
+
+
+def test_edited_description_is_rescored_without_put(cache):
+    a = article("Acme update", "https://x/acme", description="shares rise")
+    cache.polarities([a], lambda texts: [0.5])
+
+    edited = article("Acme update", "https://x/acme", description="shares plunge")
+
+    assert cache.polarities([edited], lambda texts: [-0.5]) == [-0.5]
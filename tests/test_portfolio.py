@@ -0,0 +1,60 @@
+import numpy as np
+import pandas as pd
+
+from core.portfolio import backtest_portfolio, target_weights
+
+
+def panel(n=400, symbols=5, seed=8, drift=0.0):
+    rng = np.random.default_rng(seed)
+    columns = [f"S{i}" for i in range(symbols)]
+    frame = lambda values: pd.DataFrame(values, columns=columns)
+
+    return (
+        frame(rng.normal(drift, 0.03, (n, symbols))),
+        frame(np.abs(rng.normal(0.4, 0.2, (n, symbols)))),
+        frame(rng.integers(0, 2, (n, symbols)).astype(float)),
+        frame(rng.uniform(0.5, 1.0, (n, symbols))),
+    )
+
+
+def test_gross_exposure_within_leverage():
+    for leverage in (0.5, 1.0, 2.0):
+        result = backtest_portfolio(*panel(), max_leverage=leverage, max_drawdown_limit=10.0)
+
+        gross = result["portfolio"]["gross_exposure"]
+        assert gross.max() <= leverage + 1e-12
+        np.testing.assert_allclose(gross, result["weights"].abs().sum(axis=1))
+
+
+def test_book_closed_after_first_breach():
+    cost, limit = 0.001, 0.05
+    result = backtest_portfolio(*panel(drift=-0.01), cost=cost, max_drawdown_limit=limit)
+
+    portfolio, weights = result["portfolio"], result["weights"].to_numpy()
+    breach = np.flatnonzero(portfolio["drawdown"].to_numpy() > limit)[0]
+
+    assert weights[breach].any()
+    assert not weights[breach + 1:].any()
+
+    # Closing the book is paid on the next bar, then nothing moves
+    closing = np.abs(weights[breach]).sum()
+    assert portfolio["turnover"].iloc[breach + 1] == closing
+    assert portfolio["portfolio_return"].iloc[breach + 1] == -cost * closing
+    assert not portfolio["portfolio_return"].iloc[breach + 2:].any()
+
+
+def test_nan_inputs_get_zero_weight():
+    ret, vol, pred, conf = panel(50)
+    ret.iloc[3, 0] = np.nan
+    vol.iloc[4, 1] = np.nan
+    pred.iloc[5, 2] = np.nan
+    conf.iloc[6, 3] = np.nan
+
+    weights = target_weights(ret, vol, pred, conf)
+
+    for t, s in ((3, 0), (4, 1), (5, 2), (6, 3)):
+        assert weights[t, s] == 0.0
+    assert not np.isnan(weights).any()
+
+    result = backtest_portfolio(ret, vol, pred, conf, max_drawdown_limit=10.0)
+    assert result["portfolio"]["portfolio_return"].notna().all()
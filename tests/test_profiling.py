@@ -0,0 +1,106 @@
+import tracemalloc
+
+from core import profiling
+
+
+def teardown_function():
+    profiling.disable()
+    profiling.reset()
+
+
+def test_switching_memory_off_stops_tracemalloc():
+    profiling.enable(memory=True)
+    profiling.enable(memory=False)
+
+    assert not tracemalloc.is_tracing()
+
+    profiling.enable(memory=True)
+    profiling.disable()
+
+    assert not tracemalloc.is_tracing()
+
+
+def test_leaves_foreign_tracemalloc_running():
+    tracemalloc.start()
+    try:
+        profiling.enable(memory=True)
+        profiling.disable()
+
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_stage_records_calls():
+    profiling.enable()
+
+    for _ in range(3):
+        with profiling.stage("work"):
+            pass
+
+    df = profiling.report()
+    assert df.loc[0, "stage"] == "work"
+    assert df.loc[0, "calls"] == 3
+
+
+def test_merge_combines_worker_snapshots():
+    profiling.enable()
+
+    with profiling.stage("fit"):
+        pass
+    worker = profiling.snapshot()
+
+    profiling.merge(worker)
+    profiling.merge({"fetch": {"calls": 2, "total_s": 1.0, "max_s": 0.75, "peak_mem": None}})
+
+    df = profiling.report().set_index("stage")
+    assert df.loc["fit", "calls"] == 2
+    assert df.loc["fetch", "calls"] == 2
+    assert df.loc["fetch", "max_s"] == 0.75
+
+
+def test_collector_is_private_to_its_thread():
+    import threading
+
+    stats = profiling.start_collecting("session-a")
+    try:
+        with profiling.stage("mine"):
+            pass
+
+        def other():
+            with profiling.stage("theirs"):
+                pass
+
+        t = threading.Thread(target=other)
+        t.start()
+        t.join()
+    finally:
+        profiling.stop_collecting("session-a")
+
+    assert list(stats) == ["mine"]
+    assert profiling.report().empty
+
+
+def test_collector_keeps_tracemalloc_for_its_session():
+    stats = profiling.start_collecting("session-a", memory=True)
+    try:
+        # Another caller switching process-wide memory off must not stop it
+        profiling.enable(memory=True)
+        profiling.disable()
+        assert tracemalloc.is_tracing()
+
+        with profiling.stage("alloc"):
+            _ = [0] * 10_000
+    finally:
+        profiling.stop_collecting("session-a")
+
+    assert stats["alloc"]["peak_mem"] > 0
+    assert not tracemalloc.is_tracing()
+
+
+def test_memory_enabled_follows_enable():
+    profiling.enable(memory=True)
+    assert profiling.memory_enabled()
+
+    profiling.enable()
+    assert not profiling.memory_enabled()
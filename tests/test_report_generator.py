@@ -0,0 +1,32 @@
+import io
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from core.report_generator import generate_research_report
+
+
+def build(symbol):
+    buffer = io.BytesIO()
+    generate_research_report(
+        buffer, symbol, "Logistic Regression", "Bullish", "BUY", 1.2, -0.15
+    )
+    return buffer.getvalue()
+
+
+def pages(pdf):
+    return len(re.findall(rb"/Type /Page\b", pdf))
+
+
+def test_concurrent_builds_match_a_serial_build():
+    expected = pages(build("AAA"))
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        pdfs = list(pool.map(build, [f"S{k}" for k in range(8)]))
+
+    assert expected > 1
+    for pdf in pdfs:
+        assert pdf.startswith(b"%PDF")
+        assert pages(pdf) == expected
+
+    # A later build is unaffected by earlier ones
+    assert pages(build("BBB")) == expected
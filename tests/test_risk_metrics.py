@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from core.risk_metrics import compute_all_metrics, rolling_metrics
+
+ROLLED = [
+    "sharpe", "sortino", "calmar", "annual_return", "max_drawdown",
+    "max_drawdown_duration", "var", "cvar", "hit_rate", "turnover",
+]
+
+
+@pytest.fixture
+def strategies():
+    rng = np.random.default_rng(7)
+    returns = pd.DataFrame(rng.normal(0.0005, 0.01, size=(120, 3)), columns=["a", "b", "c"])
+    returns.iloc[::9, 1] = 0.0
+    positions = pd.DataFrame(rng.choice([0.0, 0.5, 1.0], size=(120, 3)), columns=returns.columns)
+    return returns, positions
+
+
+def test_rolling_matches_metrics_of_each_window(strategies):
+    returns, positions = strategies
+    window = 20
+
+    rolled = rolling_metrics(returns, window, positions=positions)
+
+    for end in (window - 1, 57, len(returns) - 1):
+        rows = slice(end - window + 1, end + 1)
+        expected = compute_all_metrics(returns.iloc[rows], positions=positions.iloc[rows])
+
+        for name in ROLLED:
+            np.testing.assert_allclose(
+                rolled[name].iloc[end].to_numpy(), expected[name].to_numpy(),
+                rtol=1e-9, atol=1e-12, err_msg=name
+            )
+
+
+def test_rolling_drawdown_uses_window_peak():
+    returns = pd.Series([0.5] + [-0.01] * 30 + [0.0] * 10)
+
+    rolled = rolling_metrics(returns, window=10)
+
+    # The early spike is outside the last window, so the rolling peak is lower
+    expanding = (1 + returns).cumprod()
+    expanding = expanding / expanding.cummax() - 1
+    assert rolled["drawdown"].iloc[-1] == pytest.approx(0.0)
+    assert expanding.iloc[-1] < -0.2
+
+
+def test_warm_up_is_nan(strategies):
+    returns, _ = strategies
+
+    rolled = rolling_metrics(returns["a"], window=30)
+
+    for name, series in rolled.items():
+        assert series.iloc[:29].isna().all(), name
+    assert rolled["turnover"].isna().all()
+
+
+@pytest.mark.parametrize("window", [0, 1])
+def test_rolling_window_too_short(window):
+    returns = pd.Series(np.random.default_rng(0).normal(0, 0.01, 50))
+
+    with pytest.raises(ValueError, match="window"):
+        rolling_metrics(returns, window, positions=np.ones(50))
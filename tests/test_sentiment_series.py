@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+from core.sentiment_series import sentiment_features
+
+BARS = pd.date_range("2024-01-01", periods=6, freq="D", tz="UTC")
+
+
+def news(*rows):
+    return pd.DataFrame(
+        [(pd.Timestamp(t, tz="UTC"), p) for t, p in rows],
+        columns=["published_at", "polarity"]
+    )
+
+
+def test_news_after_bar_does_not_affect_it():
+    base = news(("2024-01-01 12:00", 0.4))
+    late = news(("2024-01-01 12:00", 0.4), ("2024-01-03 00:00:01", -0.9))
+
+    before = sentiment_features(BARS, base)
+    after = sentiment_features(BARS, late)
+
+    # The late article lands on the bar after its timestamp, not before
+    pd.testing.assert_frame_equal(before.iloc[:3], after.iloc[:3])
+    assert after.loc[3, "news_count"] == 1
+    assert after.loc[3, "sentiment_bar"] == -0.9
+
+
+def test_counts_and_window_means():
+    df = news(
+        ("2023-12-31 23:00", 0.5),
+        ("2024-01-02 01:00", 0.2),
+        ("2024-01-02 02:00", -0.6),
+        ("2024-01-04 00:00", 0.9),
+    )
+
+    out = sentiment_features(BARS, df, windows=(3,))
+
+    np.testing.assert_array_equal(out["news_count"], [1, 0, 2, 1, 0, 0])
+    np.testing.assert_allclose(out["sentiment_bar"], [0.5, 0, -0.2, 0.9, 0, 0])
+    # Articles over the last 3 bars: {0.5}, {0.5}, {0.5, 0.2, -0.6},
+    # {0.2, -0.6, 0.9}, {0.2, -0.6, 0.9}, {0.9}
+    np.testing.assert_allclose(
+        out["sentiment_mean_3"],
+        [0.5, 0.5, 0.1 / 3, 0.5 / 3, 0.5 / 3, 0.9]
+    )
+
+
+def test_empty_news_gives_zeros():
+    empty = news()
+
+    out = sentiment_features(BARS, empty)
+
+    assert len(out) == len(BARS)
+    assert (out.to_numpy() == 0).all()
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from core.trading_signal import BUY, HOLD, SELL, generate_signal, generate_signals, signal_labels
+
+
+def inputs(n=200, seed=5):
+    rng = np.random.default_rng(seed)
+    pred = rng.integers(0, 2, n).astype(float)
+    conf = rng.uniform(0.4, 0.9, n)
+    conf[::17] = np.nan
+    return pred, conf
+
+
+def test_defaults_match_generate_signal():
+    pred, conf = inputs()
+
+    signals = generate_signals(pred, conf)
+
+    expected = [
+        generate_signal(p, None if np.isnan(c) else c)
+        for p, c in zip(pred, conf)
+    ]
+    assert list(signal_labels(signals)) == expected
+
+
+def test_hysteresis_holds_until_exit_threshold():
+    pred = np.ones(6)
+    conf = np.array([0.5, 0.65, 0.55, 0.51, 0.45, 0.55])
+
+    signals = generate_signals(pred, conf, threshold=0.60, exit_threshold=0.50)
+
+    assert list(signals) == [HOLD, BUY, BUY, BUY, HOLD, HOLD]
+
+
+def test_min_hold_keeps_position_open():
+    pred = np.array([1, 1, 0, 0, 0, 0], dtype=float)
+    conf = np.array([0.7, 0.4, 0.4, 0.7, 0.4, 0.4])
+
+    signals = generate_signals(pred, conf, min_hold=2)
+
+    # Held for two bars, then closed; the SELL entry is held two bars too
+    assert list(signals) == [BUY, BUY, HOLD, SELL, SELL, HOLD]
+
+
+def test_2d_input_matches_per_column():
+    rng = np.random.default_rng(9)
+    pred = pd.DataFrame(rng.integers(0, 2, (120, 3)).astype(float), columns=["A", "B", "C"])
+    conf = pd.DataFrame(rng.uniform(0.4, 0.9, (120, 3)), columns=["A", "B", "C"])
+
+    signals = generate_signals(pred, conf, exit_threshold=0.55, min_hold=3)
+
+    assert isinstance(signals, pd.DataFrame)
+    assert list(signals.columns) == ["A", "B", "C"]
+    for col in signals:
+        column = generate_signals(pred[col], conf[col], exit_threshold=0.55, min_hold=3)
+        np.testing.assert_array_equal(signals[col].to_numpy(), column.to_numpy())
@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import synthetic_ohlc
+from core.feature_engineering import create_features
+from core import walk_forward
+from core.ml_model import FEATURE_COLUMNS, fit, fit_arrays, predict_proba
+from core.tuning import successive_halving
+from core.walk_forward import score_range, walk_forward_validation
+
+
+@pytest.fixture(scope="module")
+def features_df():
+    return create_features(synthetic_ohlc(260, seed=4, freq="D"))
+
+
+def test_score_range_matches_walk_forward(features_df):
+    wf = walk_forward_validation(features_df, "lr", refit_every=3)
+
+    df = features_df.dropna(subset=FEATURE_COLUMNS + ["target"]).reset_index(drop=True)
+    split = int(len(df) * 0.7)
+    rows, confidence = score_range(
+        df[FEATURE_COLUMNS].to_numpy(dtype=float), df["target"].to_numpy(),
+        split, len(df), "lr", refit_every=3
+    )
+
+    np.testing.assert_array_equal(rows, np.arange(split, len(df)))
+    np.testing.assert_allclose(confidence, wf["confidence"].to_numpy()[split:])
+
+
+def test_successive_halving_parallel_matches_serial(features_df):
+    space = {"C": [0.01, 0.1, 1.0, 10.0]}
+    kwargs = dict(space=space, n_folds=3, eta=2, refit_every=10)
+
+    serial_best, serial_history = successive_halving(features_df, "lr", **kwargs)
+    parallel_best, parallel_history = successive_halving(features_df, "lr", n_jobs=2, **kwargs)
+
+    assert serial_best == parallel_best
+    pd.testing.assert_frame_equal(serial_history, parallel_history)
+    assert serial_history["rung"].max() >= 1
+
+
+@pytest.mark.parametrize("refit_every, window", [(1, None), (4, 60)])
+def test_parallel_matches_serial(features_df, refit_every, window):
+    serial = walk_forward_validation(features_df, "lr", refit_every=refit_every, window=window)
+    parallel = walk_forward_validation(
+        features_df, "lr", refit_every=refit_every, window=window, n_jobs=2, chunksize=5
+    )
+
+    pd.testing.assert_frame_equal(serial, parallel)
+    assert serial["prediction"].notna().sum() > 50
+
+
+def test_warm_start_is_sequential(features_df):
+    with pytest.raises(ValueError):
+        walk_forward_validation(features_df, "lr", warm_start=True, n_jobs=2)
+
+
+def test_per_bar_refit_matches_fit_and_predict(features_df):
+    wf = walk_forward_validation(features_df, "lr", refit_every=1)
+
+    df = features_df.reset_index(drop=True)
+    split = int(len(df) * 0.7)
+
+    # Bar i trades the forecast made at the close of bar i - 1, from a
+    # model fitted on the rows whose target was known by then
+    expected = [
+        predict_proba(fit(df.iloc[:i - 1], "lr"), df.iloc[[i - 1]])[0]
+        for i in range(split, len(df))
+    ]
+
+    np.testing.assert_allclose(wf["confidence"].to_numpy()[split:], expected)
+    assert wf["confidence"].iloc[:split].isna().all()
+
+
+def test_warm_start_close_to_cold_refits(features_df):
+    cold = walk_forward_validation(features_df, "lr", refit_every=5)
+    warm = walk_forward_validation(features_df, "lr", refit_every=5, warm_start=True)
+
+    np.testing.assert_allclose(warm["confidence"], cold["confidence"], atol=1e-3)
+
+
+def test_fixed_window_trains_on_last_rows(features_df, monkeypatch):
+    window = 60
+    seen = []
+
+    def recording_fit(X, y, *args, **kwargs):
+        seen.append((X.copy(), y.copy()))
+        return fit_arrays(X, y, *args, **kwargs)
+
+    monkeypatch.setattr(walk_forward, "fit_arrays", recording_fit)
+    walk_forward_validation(features_df, "lr", refit_every=4, window=window)
+
+    X_all = features_df[FEATURE_COLUMNS].to_numpy(dtype=float)
+    split = int(len(X_all) * 0.7)
+
+    assert len(seen) == len(range(split, len(X_all), 4))
+    for i, (X, y) in zip(range(split, len(X_all), 4), seen):
+        assert len(X) == window
+        np.testing.assert_array_equal(X, X_all[i - 1 - window:i - 1])